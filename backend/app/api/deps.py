@@ -2,17 +2,18 @@
 
 from typing import Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
-from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, request_subject
 from app.core.security import verify_password
 from app.models.user import User
 from app.schemas.auth import TokenPayload
+from app.schemas.movie import parse_movie_fields
+from app.services.job_queue import JobQueueUnavailableError, job_queue
 
 security = HTTPBearer()
 
@@ -21,6 +22,7 @@ async def get_current_user(
     token: str = Depends(security), db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user."""
+    from jose import JWTError, jwt
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,6 +56,8 @@ async def get_current_user(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
 
+    # 记录当前用户，写入后其读请求暂时走主库
+    request_subject.set(user.email)
     return user
 
 
@@ -80,3 +84,24 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     if not verify_password(password, user.hashed_password):
         return None
     return user
+
+
+def get_movie_fields(
+    fields: str
+    | None = Query(None, description="只返回这些字段（逗号分隔），如 id,title,poster_url,rating"),
+) -> tuple[str, ...] | None:
+    """Parse the sparse fieldset requested by ``fields=``."""
+    try:
+        return parse_movie_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def require_job_queue() -> None:
+    """Fail fast with 503 when background jobs cannot be queued."""
+    try:
+        job_queue.check_available()
+    except JobQueueUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
@@ -0,0 +1,121 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from app.api.deps import get_current_active_superuser, require_job_queue
+from app.core.config import settings
+from app.core.database import pool_status
+from app.core.profiler import ProfilerBusyError, loop_lag_monitor, profile_event_loop
+from app.core.tracing import InMemoryExporter, tracer
+from app.models.user import User
+from app.services.catalog_export import MEDIA_TYPES, export_filename, stream_catalog
+from app.services.catalog_import import (
+    IMPORT_CATALOG,
+    detect_format,
+    store_catalog_upload,
+)
+from app.services.job_queue import job_queue
+from app.services.media_tasks import enqueue_poster_backfill
+from app.services.segment_cache import segment_cache
+from app.services.storage_service import FileTooLargeError
+
+router = APIRouter()
+
+
+@router.get("/cache/segments")
+async def get_segment_cache_stats(
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """获取视频分片缓存命中率"""
+    return segment_cache.stats()
+
+
+@router.post("/media/posters/backfill")
+async def backfill_posters(current_user: User = Depends(get_current_active_superuser)):
+    """为没有海报的本地电影排队提取海报"""
+    job_ids = await enqueue_poster_backfill()
+    return {"queued": len(job_ids), "job_ids": job_ids}
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats(current_user: User = Depends(get_current_active_superuser)):
+    """获取数据库连接池状态"""
+    return pool_status()
+
+
+@router.post("/catalog/import", dependencies=[Depends(require_job_queue)])
+async def import_catalog(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = Query(None, description="文件格式"),
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """批量导入电影目录（CSV/NDJSON），按 external_id 更新已有电影"""
+    if format is None:
+        try:
+            format = detect_format(file.filename or "")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        path = await store_catalog_upload(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    job = await job_queue.enqueue(
+        IMPORT_CATALOG, {"path": path, "format": format, "user_id": current_user.id}
+    )
+    return {"job_id": job.id}
+
+
+@router.get("/catalog/export")
+async def export_catalog(
+    format: Literal["csv", "ndjson"] = Query("ndjson", description="文件格式"),
+    gzip: bool = Query(False, description="是否gzip压缩"),
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """流式导出全部电影目录"""
+    filename = export_filename(format, gzip)
+    return StreamingResponse(
+        stream_catalog(format, gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/traces")
+async def get_recent_traces(
+    limit: int = Query(20, ge=1, le=200, description="返回的链路数量"),
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """查看最近采样的请求链路（内存导出器）"""
+    if not isinstance(tracer.exporter, InMemoryExporter):
+        raise HTTPException(status_code=404, detail="未启用内存链路导出器")
+    return {"traces": tracer.exporter.recent(limit)}
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, description="采样时长(秒)"),
+    interval: float = Query(0.005, ge=0.001, le=1.0, description="采样间隔(秒)"),
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """对当前 worker 的事件循环线程采样，返回火焰图折叠栈格式"""
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400, detail=f"采样时长不能超过 {settings.PROFILER_MAX_SECONDS} 秒"
+        )
+    try:
+        return await profile_event_loop(seconds, interval)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/loop-lag")
+async def get_loop_stalls(current_user: User = Depends(get_current_active_superuser)):
+    """查看最近阻塞事件循环的调用栈"""
+    return {
+        "enabled": settings.LOOP_LAG_MONITOR,
+        "threshold": loop_lag_monitor.threshold,
+        "stalls": loop_lag_monitor.recent(),
+    }
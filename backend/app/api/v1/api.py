@@ -2,9 +2,12 @@
 
 from fastapi import APIRouter
 
+from app.api.v1.admin import router as admin_router
 from app.api.v1.auth import router as auth_router
 from app.api.v1.cast import router as cast_router
 from app.api.v1.favorites import router as favorites_router
+from app.api.v1.images import router as images_router
+from app.api.v1.jobs import router as jobs_router
 from app.api.v1.movies import router as movies_router
 
 api_router = APIRouter()
@@ -13,3 +16,6 @@ api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(movies_router, prefix="/movies", tags=["movies"])
 api_router.include_router(favorites_router, prefix="/favorites", tags=["favorites"])
 api_router.include_router(cast_router, prefix="/cast", tags=["casting"])
+api_router.include_router(images_router, prefix="/images", tags=["images"])
+api_router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
@@ -1,19 +1,44 @@
-from typing import List
+import base64
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_movie_fields
+from app.core.compression import precompressed_cache
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.etag import (
+    MOVIES_VERSION_KEY,
+    bump_version,
+    current_version,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from app.core.redis import redis_client
 from app.models.favorite import Favorite
 from app.models.movie import Movie
 from app.models.user import User
-from app.schemas.favorite import FavoriteResponse
-from app.schemas.movie import MovieResponse
+from app.schemas.favorite import FavoriteMovieList, FavoriteResponse, FavoriteStatus
+from app.schemas.movie import movie_list_schema
 
 router = APIRouter()
 
 
+def _favorites_version_key(user_id: int) -> str:
+    return f"favorites:{user_id}:version"
+
+
+async def _invalidate_favorites_cache(user_id: int) -> None:
+    """Bump the user's favorites version so cached pages are never served again.
+
+    The movie's favorite count changed too, so movie lists are invalidated.
+    """
+    await bump_version(_favorites_version_key(user_id))
+    await bump_version(MOVIES_VERSION_KEY)
+
+
 @router.post("/{movie_id}", response_model=FavoriteResponse)
 async def add_favorite(
     movie_id: int,
@@ -33,6 +58,7 @@ async def add_favorite(
 
     # 创建收藏
     favorite = await Favorite.create(db, user_id=current_user.id, movie_id=movie_id)
+    await _invalidate_favorites_cache(current_user.id)
 
     return favorite
 
@@ -50,14 +76,98 @@ async def remove_favorite(
         raise HTTPException(status_code=404, detail="未收藏该电影")
 
     await favorite.delete(db)
+    await _invalidate_favorites_cache(current_user.id)
 
     return {"message": "取消收藏成功"}
 
 
-@router.get("/", response_model=List[MovieResponse])
+@router.get("/{movie_id}", response_model=FavoriteStatus)
+async def get_favorite_status(
+    movie_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """查询是否已收藏"""
+    favorite = await Favorite.get_user_favorite(db, current_user.id, movie_id)
+    return {"movie_id": movie_id, "is_favorite": favorite is not None}
+
+
+def _encode_cursor(key: tuple[int, datetime] | None) -> str | None:
+    if key is None:
+        return None
+    favorite_id, created_at = key
+    raw = f"{favorite_id}|{created_at.isoformat()}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, datetime]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        favorite_id, created_at = raw.split("|", 1)
+        return int(favorite_id), datetime.fromisoformat(created_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+async def _favorites_page(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    limit: int,
+    fields: tuple[str, ...] | None,
+    after: tuple[int, datetime] | None,
+) -> str:
+    movies, total, next_key = await Favorite.get_user_movies(
+        db, user_id, page, limit, fields, after
+    )
+    return movie_list_schema(fields, FavoriteMovieList)(
+        movies=movies,
+        total=total,
+        page=page,
+        limit=limit,
+        next_cursor=_encode_cursor(next_key),
+    ).model_dump_json()
+
+
+@router.get("/", response_model=FavoriteMovieList)
 async def get_favorites(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    page: int = Query(1, ge=1, description="页码"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: str | None = Query(None, description="上一页返回的 next_cursor；指定后忽略 page，按游标翻页"),
+    if_none_match: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+    fields: tuple[str, ...] | None = Depends(get_movie_fields),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """获取收藏列表"""
-    movies = await Favorite.get_user_movies(db, current_user.id)
-    return movies
+    """获取收藏列表（支持游标分页和 If-None-Match 条件请求）"""
+    after = _decode_cursor(cursor) if cursor else None
+    version = await current_version(_favorites_version_key(current_user.id))
+    # 收藏的电影信息（如收藏数）随电影列表版本变化
+    movies_version = await current_version(MOVIES_VERSION_KEY)
+    if version is None or movies_version is None:
+        # Redis 不可用：不缓存，也不生成 ETag
+        payload = await _favorites_page(db, current_user.id, page, limit, fields, after)
+        return Response(content=payload, media_type="application/json")
+
+    position = f"c{cursor}" if cursor else f"p{page}"
+    etag = make_etag(
+        "favorites", current_user.id, version, movies_version, position, limit, fields
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers["Cache-Control"])
+
+    cache_key = (
+        f"favorites:{current_user.id}:v{version}:m{movies_version}:{position}:{limit}"
+        f":{','.join(fields) if fields else '*'}"
+    )
+    cached = await redis_client.get(cache_key)
+    if cached is None:
+        cached = await _favorites_page(db, current_user.id, page, limit, fields, after)
+        await redis_client.set(cache_key, cached, ex=settings.FAVORITES_CACHE_TTL)
+
+    # 压缩结果按缓存键保存，命中时直接返回压缩后的字节
+    return precompressed_cache.response(
+        cache_key, cached, accept_encoding, headers=headers
+    )
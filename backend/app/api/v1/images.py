@@ -0,0 +1,70 @@
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.models.movie import Movie
+from app.services.image_service import (
+    ImageFetchError,
+    ImageSourceNotAllowedError,
+    image_service,
+)
+from app.services.storage_service import media_dir
+from app.services.thumbnail_service import POSTER_NAME, thumbnail_name
+
+router = APIRouter()
+
+PosterSize = Literal["thumbnail", "card", "detail"]
+
+
+async def _poster_response(url: str, size: str) -> FileResponse:
+    try:
+        image_service.check_source(url)
+        path = await image_service.get_variant_path(url, size)
+    except ImageSourceNotAllowedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImageFetchError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    # 同一地址与尺寸的图片内容不变，可长期缓存
+    return FileResponse(
+        path,
+        media_type="image/webp",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@router.get("/poster")
+async def get_poster(
+    url: str = Query(..., description="海报原始地址"),
+    size: PosterSize = Query("card", description="尺寸"),
+):
+    """获取缩放后的海报图片"""
+    return await _poster_response(url, size)
+
+
+@router.get("/movies/{movie_id}/{size}")
+async def get_movie_poster(
+    movie_id: int, size: PosterSize, db: AsyncSession = Depends(get_read_db)
+):
+    """获取电影海报图片"""
+    movie = await Movie.get_by_id(db, movie_id)
+    if not movie or not movie.poster_url:
+        raise HTTPException(status_code=404, detail="海报不存在")
+
+    # 本地电影的海报在上传后已提取好各尺寸，直接返回
+    if movie.is_local and movie.file_path and movie.poster_url.startswith("/"):
+        name = POSTER_NAME if size == "detail" else thumbnail_name(size)
+        path = os.path.join(media_dir(movie.file_path), name)
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="海报不存在")
+        return FileResponse(
+            path,
+            media_type="image/jpeg",
+            headers={"Cache-Control": "public, max-age=86400"},
+        )
+
+    return await _poster_response(movie.poster_url, size)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import get_current_user, require_job_queue
+from app.models.user import User
+from app.schemas.job import JobResponse
+from app.services.job_queue import job_queue
+
+router = APIRouter()
+
+
+@router.get(
+    "/{job_id}", response_model=JobResponse, dependencies=[Depends(require_job_queue)]
+)
+async def get_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """获取后台任务状态"""
+    job = await job_queue.get(job_id)
+    if not job or (
+        job.payload.get("user_id") != current_user.id and not current_user.is_superuser
+    ):
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return JobResponse(
+        id=job.id,
+        name=job.name,
+        status=job.status.value,
+        progress=job.progress,
+        message=job.message,
+        attempts=job.attempts,
+        max_retries=job.max_retries,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
@@ -1,53 +1,380 @@
+import mimetypes
 import os
-import uuid
+import re
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_movie_fields, require_job_queue
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.etag import (
+    MOVIES_VERSION_KEY,
+    bump_version,
+    current_version,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from app.models.media_info import MediaInfo
 from app.models.movie import Movie
 from app.models.user import User
-from app.schemas.movie import MovieCreate, MovieList, MovieResponse
+from app.schemas.movie import (
+    MediaInfoResponse,
+    MovieCreate,
+    MovieList,
+    MovieManifest,
+    MovieResponse,
+    MovieSearchResponse,
+    MovieUploadResponse,
+    SeekPoint,
+    movie_list_schema,
+    movie_schema,
+)
+from app.services.job_queue import job_queue
+from app.services.media_tasks import PROCESS_UPLOAD, local_media_url
+from app.services.packaging_service import (
+    DASH_MANIFEST,
+    HLS_MASTER,
+    is_packaged,
+    package_dir,
+)
+from app.services.search_service import search_service
+from app.services.segment_cache import segment_cache
+from app.services.storage_service import (
+    FileTooLargeError,
+    media_dir,
+    store_upload,
+)
+from app.services.trickplay_service import TRICKPLAY_VTT, trickplay_vtt_path
 
 router = APIRouter()
 
+STREAM_ASSET_PATTERN = re.compile(r"^[\w.-]+\.(m3u8|mpd|m4s)$")
+MEDIA_ASSET_PATTERN = re.compile(r"^[\w.-]+\.(jpg|vtt)$")
+MEDIA_TYPES = {"jpg": "image/jpeg", "vtt": "text/vtt"}
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_MEDIA_TYPES = {
+    "m3u8": "application/vnd.apple.mpegurl",
+    "mpd": "application/dash+xml",
+    "m4s": "video/iso.segment",
+}
+
+
+async def _get_local_movie(db: AsyncSession, movie_id: int) -> Movie:
+    movie = await Movie.get_by_id(db, movie_id)
+    if not movie or not movie.is_local or not movie.file_path:
+        raise HTTPException(status_code=404, detail="电影不存在")
+    return movie
+
+
+def _parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range`` header into inclusive byte offsets."""
+    if not range_header:
+        return None
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(
+            status_code=416,
+            detail="无效的 Range 请求",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    first, last = match.groups()
+    if first == "":
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="无效的 Range 请求",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _movie_list(
+    movies: list,
+    total: int,
+    page: int,
+    limit: int,
+    fields: tuple[str, ...] | None,
+    headers: dict[str, str] | None = None,
+):
+    payload = {"movies": movies, "total": total, "page": page, "limit": limit}
+    if fields is None:
+        return payload
+    # 裁剪后的结构与 response_model 不同，直接序列化返回
+    return Response(
+        content=movie_list_schema(fields)(**payload).model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
+
 
 @router.get("/search", response_model=MovieList)
 async def search_movies(
     q: str = Query(..., description="搜索关键词"),
     page: int = Query(1, ge=1, description="页码"),
     limit: int = Query(20, ge=1, le=100, description="每页数量"),
-    db: AsyncSession = Depends(get_db),
+    fields: tuple[str, ...] | None = Depends(get_movie_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """搜索电影"""
-    movies, total = await Movie.search(db, q, page, limit)
-    return {"movies": movies, "total": total, "page": page, "limit": limit}
+    movies, total = await Movie.search(db, q, page, limit, fields)
+    return _movie_list(movies, total, page, limit, fields)
+
+
+@router.get("/search/federated", response_model=MovieSearchResponse)
+async def federated_search(
+    q: str = Query(..., min_length=1, description="搜索关键词"),
+    page: int = Query(1, ge=1, description="页码"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """聚合搜索本地库、豆瓣和 YouTube 预告片"""
+    return await search_service.search_movies(q, page, db)
+
+
+@router.get("/popular", response_model=MovieList)
+async def get_popular_movies(
+    page: int = Query(1, ge=1, description="页码"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    fields: tuple[str, ...] | None = Depends(get_movie_fields),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取收藏最多的电影"""
+    movies, total = await Movie.get_most_favorited(db, page, limit, fields)
+    return _movie_list(movies, total, page, limit, fields)
+
+
+def _movie_etag(
+    movie_id: int,
+    updated_at,
+    favorite_count: int,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    # SQLite 时间戳只精确到秒，因此把 favorite_count 也计入 ETag
+    return make_etag("movie", movie_id, updated_at, favorite_count, fields)
 
 
 @router.get("/{movie_id}", response_model=MovieResponse)
-async def get_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
-    """获取电影详情"""
-    movie = await Movie.get_by_id(db, movie_id)
+async def get_movie(
+    movie_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    fields: tuple[str, ...] | None = Depends(get_movie_fields),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取电影详情（支持 If-None-Match 条件请求）"""
+    if if_none_match:
+        # 先只查版本列，未变化时直接返回 304
+        version = await Movie.get_version(db, movie_id)
+        if version is not None:
+            etag = _movie_etag(movie_id, *version, fields)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    if fields is None:
+        movie = await Movie.get_by_id(db, movie_id)
+        if not movie:
+            raise HTTPException(status_code=404, detail="电影不存在")
+        response.headers["ETag"] = _movie_etag(
+            movie.id, movie.updated_at, movie.favorite_count
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        return movie
+
+    # 只查询请求的列，外加生成 ETag 所需的列
+    columns = tuple(dict.fromkeys((*fields, "updated_at", "favorite_count")))
+    movie = await Movie.get_by_id(db, movie_id, columns)
     if not movie:
         raise HTTPException(status_code=404, detail="电影不存在")
-    return movie
+    etag = _movie_etag(movie_id, movie["updated_at"], movie["favorite_count"], fields)
+    return Response(
+        content=movie_schema(fields).model_validate(movie).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/{movie_id}/manifest", response_model=MovieManifest)
+async def get_movie_manifest(movie_id: int, db: AsyncSession = Depends(get_read_db)):
+    """获取自适应码率播放清单地址"""
+    movie = await _get_local_movie(db, movie_id)
+    trickplay_url = None
+    if os.path.exists(trickplay_vtt_path(movie.file_path)):
+        trickplay_url = local_media_url(movie_id, TRICKPLAY_VTT)
+    if not is_packaged(movie.file_path):
+        return {"movie_id": movie_id, "ready": False, "trickplay_url": trickplay_url}
+
+    base_url = f"{settings.API_V1_STR}/movies/{movie_id}/stream"
+    return {
+        "movie_id": movie_id,
+        "ready": True,
+        "hls_url": f"{base_url}/{HLS_MASTER}",
+        "dash_url": f"{base_url}/{DASH_MANIFEST}",
+        "trickplay_url": trickplay_url,
+    }
+
+
+@router.get("/{movie_id}/media-info", response_model=MediaInfoResponse)
+async def get_media_info(movie_id: int, db: AsyncSession = Depends(get_read_db)):
+    """获取电影编码、分辨率、码率等技术信息"""
+    media_info = await MediaInfo.get_by_movie_id(db, movie_id)
+    if not media_info:
+        raise HTTPException(status_code=404, detail="媒体信息尚未生成")
+    return MediaInfoResponse(
+        movie_id=movie_id,
+        container=media_info.container,
+        video_codec=media_info.video_codec,
+        audio_codec=media_info.audio_codec,
+        width=media_info.width,
+        height=media_info.height,
+        frame_rate=media_info.frame_rate,
+        bitrate=media_info.bitrate,
+        duration_seconds=media_info.duration_seconds,
+        keyframe_count=len(media_info.keyframes or []),
+    )
+
+
+@router.get("/{movie_id}/seek", response_model=SeekPoint)
+async def seek_movie(
+    movie_id: int,
+    t: float = Query(..., ge=0, description="目标时间(秒)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """根据关键帧索引返回跳转位置对应的字节偏移"""
+    media_info = await MediaInfo.get_by_movie_id(db, movie_id)
+    keyframe = media_info.keyframe_at(t) if media_info else None
+    if keyframe is None:
+        raise HTTPException(status_code=404, detail="关键帧索引尚未生成")
+    keyframe_time, byte_offset = keyframe
+    return {
+        "movie_id": movie_id,
+        "requested_time": t,
+        "keyframe_time": keyframe_time,
+        "byte_offset": byte_offset,
+    }
+
+
+@router.get("/{movie_id}/stream/{asset_name}")
+async def get_stream_asset(
+    movie_id: int, asset_name: str, db: AsyncSession = Depends(get_read_db)
+):
+    """获取 HLS/DASH 播放清单或分片"""
+    match = STREAM_ASSET_PATTERN.match(asset_name)
+    if not match:
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    movie = await _get_local_movie(db, movie_id)
+    path = os.path.join(package_dir(movie.file_path), asset_name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    # 分片按内容寻址，可长期缓存；清单缓存时间较短
+    max_age = 31536000 if match.group(1) == "m4s" else 3600
+    return Response(
+        content=await segment_cache.read_file(path),
+        media_type=STREAM_MEDIA_TYPES[match.group(1)],
+        headers={"Cache-Control": f"public, max-age={max_age}"},
+    )
+
+
+@router.get("/{movie_id}/media/{asset_name}")
+async def get_media_asset(
+    movie_id: int, asset_name: str, db: AsyncSession = Depends(get_read_db)
+):
+    """获取电影海报、缩略图等派生文件"""
+    match = MEDIA_ASSET_PATTERN.match(asset_name)
+    if not match:
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    movie = await _get_local_movie(db, movie_id)
+    path = os.path.join(media_dir(movie.file_path), asset_name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    # 缩略图精灵图只生成一次，可长期缓存
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[match.group(1)],
+        headers={"Cache-Control": "public, max-age=604800"},
+    )
+
+
+@router.get("/{movie_id}/file")
+async def stream_movie_file(
+    movie_id: int,
+    range_header: str | None = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """按字节范围播放原始电影文件"""
+    movie = await _get_local_movie(db, movie_id)
+    if not os.path.isfile(movie.file_path):
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    size = os.path.getsize(movie.file_path)
+    byte_range = _parse_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Cache-Control": "public, max-age=31536000",
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        segment_cache.iter_range(movie.file_path, start, end),
+        status_code=206 if byte_range else 200,
+        media_type=mimetypes.guess_type(movie.file_path)[0]
+        or "application/octet-stream",
+        headers=headers,
+    )
 
 
 @router.get("/", response_model=MovieList)
 async def get_movies(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    if_none_match: str | None = Header(None),
+    fields: tuple[str, ...] | None = Depends(get_movie_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """获取电影列表"""
-    movies, total = await Movie.get_list(db, page, limit)
-    return {"movies": movies, "total": total, "page": page, "limit": limit}
+    """获取电影列表（支持 If-None-Match 条件请求）"""
+    # 列表版本号在电影数据变化时递增；Redis 不可用时不生成 ETag
+    version = await current_version(MOVIES_VERSION_KEY)
+    headers = {}
+    if version is not None:
+        etag = make_etag("movies", version, page, limit, fields)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
+    movies, total = await Movie.get_list(db, page, limit, fields)
+    response.headers.update(headers)
+    return _movie_list(movies, total, page, limit, fields, headers)
 
-@router.post("/upload", response_model=MovieResponse)
+
+# 任务队列不可用时直接拒绝，避免保存了文件却没有任务处理
+@router.post(
+    "/upload",
+    response_model=MovieUploadResponse,
+    dependencies=[Depends(require_job_queue)],
+)
 async def upload_movie(
     file: UploadFile = File(...),
     title: str = Query(...),
@@ -56,27 +383,27 @@ async def upload_movie(
     db: AsyncSession = Depends(get_db),
 ):
     """上传电影文件"""
-    # 创建上传目录
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # 保存文件
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(upload_dir, unique_filename)
-
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    # 边写入边计算哈希，相同内容只保存一份
+    try:
+        stored = await store_upload(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     # 创建电影记录
     movie = await Movie.create(
         db,
         title=title,
         description=description,
-        file_path=file_path,
+        file_path=stored.path,
+        content_hash=stored.sha256,
         user_id=current_user.id,
         is_local=True,
     )
+    await bump_version(MOVIES_VERSION_KEY)
 
-    return movie
+    # 媒体处理交给后台任务，接口立即返回
+    job = await job_queue.enqueue(
+        PROCESS_UPLOAD, {"movie_id": movie.id, "user_id": current_user.id}
+    )
+
+    return {"movie_id": movie.id, "job_id": job.id, "movie": movie}
@@ -0,0 +1,159 @@
+"""Bounded in-process and on-disk LRU caches."""
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache tier."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+    capacity_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from this tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        """Export counters including the derived hit ratio."""
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class MemoryLRUCache:
+    """LRU cache of byte strings bounded by total size."""
+
+    def __init__(self, capacity_bytes: int) -> None:
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats(capacity_bytes=capacity_bytes)
+
+    def get(self, key: str) -> bytes | None:
+        """Get a value and mark it most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        if len(value) > self.stats.capacity_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.stats.size_bytes -= len(previous)
+            self._entries[key] = value
+            self.stats.size_bytes += len(value)
+            while self.stats.size_bytes > self.stats.capacity_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.stats.size_bytes -= len(evicted)
+                self.stats.evictions += 1
+            self.stats.entries = len(self._entries)
+
+
+class DiskLRUCache:
+    """LRU cache of files in a directory, bounded by total size.
+
+    Methods do blocking file I/O; call them from a worker thread. The size
+    index is kept per process, so N server workers sharing a directory can
+    together use up to N times ``capacity_bytes``; size the limit per worker.
+    """
+
+    def __init__(self, directory: str, capacity_bytes: int, suffix: str = "") -> None:
+        self.directory = directory
+        self.suffix = suffix
+        self._index: OrderedDict[str, int] | None = None
+        self._lock = threading.Lock()
+        self.stats = CacheStats(capacity_bytes=capacity_bytes)
+
+    def path_for(self, key: str) -> str:
+        """File path used for a key."""
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + self.suffix)
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        # Rebuild recency from mtimes so the cache survives restarts.
+        if self._index is None:
+            found = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    found.append((stat.st_mtime, path, stat.st_size))
+            found.sort()
+            self._index = OrderedDict((path, size) for _, path, size in found)
+            self.stats.size_bytes = sum(self._index.values())
+            self.stats.entries = len(self._index)
+        return self._index
+
+    def get_path(self, key: str) -> str | None:
+        """Return the cached file for a key and mark it most recently used."""
+        path = self.path_for(key)
+        with self._lock:
+            index = self._load_index()
+            if path not in index or not os.path.exists(path):
+                index.pop(path, None)
+                self.stats.misses += 1
+                return None
+            index.move_to_end(path)
+            self.stats.hits += 1
+        os.utime(path)
+        return path
+
+    def get(self, key: str) -> bytes | None:
+        """Read a cached value."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes) -> str:
+        """Write a value atomically and evict least recently used files to fit."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(value)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            index = self._load_index()
+            previous = index.pop(path, None)
+            if previous is not None:
+                self.stats.size_bytes -= previous
+            index[path] = len(value)
+            self.stats.size_bytes += len(value)
+            while self.stats.size_bytes > self.stats.capacity_bytes and len(index) > 1:
+                evicted_path, size = index.popitem(last=False)
+                self.stats.size_bytes -= size
+                self.stats.evictions += 1
+                try:
+                    os.remove(evicted_path)
+                except FileNotFoundError:
+                    pass
+            self.stats.entries = len(index)
+        return path
@@ -0,0 +1,265 @@
+"""gzip/brotli response compression and precompressed cached payloads."""
+
+import asyncio
+import gzip
+import zlib
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+
+from app.core.cache import MemoryLRUCache
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/dash+xml",
+    "application/vnd.apple.mpegurl",
+    "image/svg+xml",
+)
+# Bodies above this are compressed in a worker thread instead of on the loop.
+OFFLOAD_THRESHOLD = 256 * 1024
+
+
+@lru_cache
+def _brotli():
+    # brotli is optional; without it only gzip is offered.
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Supported content codings, in order of preference."""
+    return ("br", "gzip") if _brotli() is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """Best supported coding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Whether a media type benefits from compression."""
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body."""
+    if encoding == "br":
+        return _brotli().compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output byte-identical for identical input.
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed responses."""
+
+    def __init__(self, encoding: str) -> None:
+        if encoding == "br":
+            self._br = _brotli().Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._br = None
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, wbits=31)
+
+    def process(self, chunk: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(chunk) + self._br.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._zlib.flush()
+
+
+def _vary_headers(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    # Any response that could have been compressed depends on Accept-Encoding,
+    # whichever encoding was actually chosen.
+    vary = [value for name, value in headers if name == b"vary"]
+    result = [(name, value) for name, value in headers if name != b"vary"]
+    result.append((b"vary", b", ".join([*vary, b"Accept-Encoding"])))
+    return result
+
+
+def _compressed_headers(
+    headers: list[tuple[bytes, bytes]], encoding: str, length: int | None
+) -> list[tuple[bytes, bytes]]:
+    result = []
+    for name, value in headers:
+        if name == b"content-length":
+            continue
+        if name == b"etag" and not value.startswith(b"W/"):
+            # The compressed bytes differ, so a strong validator no longer holds.
+            value = b"W/" + value
+        result.append((name, value))
+    result.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        result.append((b"content-length", str(length).encode()))
+    return _vary_headers(result)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses above COMPRESSION_MIN_SIZE.
+
+    Only successful responses with a compressible type and no existing
+    Content-Encoding are touched, so precompressed and binary responses
+    pass straight through. Streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = choose_encoding(accept)
+
+        start: dict[str, Any] | None = None
+        streamer: _StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message) -> None:
+            nonlocal start, streamer, passthrough
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                length = headers.get(b"content-length")
+                if (
+                    message["status"] != 200
+                    or b"content-encoding" in headers
+                    or b"no-transform" in headers.get(b"cache-control", b"")
+                    or not is_compressible(
+                        headers.get(b"content-type", b"").decode("latin-1")
+                    )
+                    or (
+                        length is not None
+                        and int(length) < settings.COMPRESSION_MIN_SIZE
+                    )
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                if encoding is None:
+                    # Sent as is, but a gzip client would get another variant.
+                    passthrough = True
+                    await send(
+                        {
+                            **message,
+                            "headers": _vary_headers(message.get("headers", [])),
+                        }
+                    )
+                    return
+                start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if streamer is not None:
+                chunk = streamer.process(body) if body else b""
+                if not more_body:
+                    chunk += streamer.finish()
+                await send({**message, "body": chunk})
+                return
+
+            headers = start.get("headers", [])
+            if not more_body:
+                if len(body) < settings.COMPRESSION_MIN_SIZE:
+                    await send(start)
+                    await send(message)
+                    return
+                if len(body) > OFFLOAD_THRESHOLD:
+                    compressed = await asyncio.to_thread(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+                headers = _compressed_headers(headers, encoding, len(compressed))
+                await send({**start, "headers": headers})
+                await send({**message, "body": compressed})
+                return
+
+            streamer = _StreamCompressor(encoding)
+            await send(
+                {**start, "headers": _compressed_headers(headers, encoding, None)}
+            )
+            await send({**message, "body": streamer.process(body)})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedCache:
+    """Compressed variants of cached payloads, made once per cache key.
+
+    Keys must change whenever the payload does (e.g. include a version), so
+    a stored variant can never be stale.
+    """
+
+    def __init__(self, capacity_bytes: int) -> None:
+        self.cache = MemoryLRUCache(capacity_bytes)
+
+    def response(
+        self,
+        cache_key: str,
+        body: str | bytes,
+        accept_encoding: str | None,
+        media_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Response for ``body`` in the best encoding the client accepts."""
+        if isinstance(body, str):
+            body = body.encode()
+        headers = dict(headers or {})
+        if (
+            not settings.COMPRESSION_ENABLED
+            or len(body) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        # Set for identity responses too, so caches keep the variants apart.
+        headers["Vary"] = "Accept-Encoding"
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            return Response(content=body, media_type=media_type, headers=headers)
+
+        key = f"{encoding}:{cache_key}"
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            self.cache.set(key, compressed)
+        headers["Content-Encoding"] = encoding
+        return Response(content=compressed, media_type=media_type, headers=headers)
+
+
+# Global precompressed payload cache instance
+precompressed_cache = PrecompressedCache(settings.COMPRESSION_CACHE_BYTES)
@@ -1,36 +1,225 @@
 """Database configuration and session management."""
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+import os
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "migrations",
+)
+
+
+# Dialects the models' upserts (ON CONFLICT) are written for.
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised when the database is not at the migration head revision."""
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://")
+    return url
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    options: dict[str, Any] = {"echo": settings.DEBUG, "pool_pre_ping": True}
+    # SQLite uses a single-connection pool without sizing knobs.
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    engine = create_async_engine(url, **options)
+    if engine.dialect.name not in SUPPORTED_DIALECTS:
+        raise ValueError(
+            f"Unsupported database dialect {engine.dialect.name!r}; "
+            f"expected one of {', '.join(SUPPORTED_DIALECTS)}"
+        )
+    return engine
+
 
 # Async engine for PostgreSQL
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
-
-async_engine = create_async_engine(
-    database_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=300,
+database_url = _async_url(settings.DATABASE_URL)
+async_engine = _create_engine(database_url)
+
+# Read-only engine for GET routes; falls back to the primary
+read_database_url = (
+    _async_url(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
 )
+read_engine = _create_engine(read_database_url) if read_database_url else async_engine
+
+instrument_engine(async_engine.sync_engine, "primary")
+if read_engine is not async_engine:
+    instrument_engine(read_engine.sync_engine, "replica")
 
 # Async session maker
 AsyncSessionLocal = async_sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 Base = declarative_base()
 
+# Subject (user email) of the authenticated request, set by get_current_user.
+request_subject: ContextVar[str | None] = ContextVar("request_subject", default=None)
+
+# subject -> monotonic deadline until which reads must go to the primary
+_recent_writers: dict[str, float] = {}
+# Strong references to fire-and-forget marker writes until they finish.
+_marker_tasks: set[asyncio.Task] = set()
+
+
+def _recent_write_key(subject: str) -> str:
+    return f"db:recent_write:{subject}"
+
+
+@event.listens_for(Session, "after_commit")
+def _record_recent_write(session: Session) -> None:
+    """Pin the committing user's reads to the primary while replicas catch up."""
+    subject = request_subject.get()
+    if subject is None or session.info.get("read_only"):
+        return
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    now = time.monotonic()
+    # Drop expired markers of users who never read again.
+    for expired in [
+        key for key, deadline in _recent_writers.items() if deadline <= now
+    ]:
+        del _recent_writers[expired]
+    _recent_writers[subject] = now + window
+    if redis_client.client is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Committed outside the event loop (e.g. a sync script): local marker only.
+        return
+    # Share the marker with other workers without blocking the commit.
+    task = loop.create_task(
+        redis_client.set(_recent_write_key(subject), "1", ex=max(int(window), 1))
+    )
+    _marker_tasks.add(task)
+    task.add_done_callback(_marker_task_done)
+
+
+def _marker_task_done(task: asyncio.Task) -> None:
+    _marker_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("写入读写一致性标记失败: %s", task.exception())
+
+
+async def _has_recent_write(subject: str) -> bool:
+    deadline = _recent_writers.get(subject)
+    if deadline is not None:
+        if deadline > time.monotonic():
+            return True
+        del _recent_writers[subject]
+    return await redis_client.get(_recent_write_key(subject)) is not None
+
+
+def _bearer_subject(request: Request) -> str | None:
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY.get_secret_value(),
+            algorithms=[settings.ALGORITHM],
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+@lru_cache
+def migration_heads() -> frozenset[str]:
+    """Head revision(s) of the Alembic scripts shipped with this build."""
+    from alembic.script import ScriptDirectory
+
+    return frozenset(ScriptDirectory(MIGRATIONS_DIR).get_heads())
+
+
+def _schema_verified_key(heads: frozenset[str]) -> str:
+    return f"db:schema_revision:{','.join(sorted(heads))}"
+
+
+async def current_revisions() -> frozenset[str]:
+    """Revision(s) recorded in the database's ``alembic_version`` table."""
+    async with async_engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            return frozenset()
+        return frozenset(result.scalars())
+
+
+async def verify_schema() -> None:
+    """Check the database is at the migration head with a single query.
+
+    A successful check is shared through Redis, so the other workers of a
+    rolling deploy start without touching the database at all.
+    """
+    heads = migration_heads()
+    verified_key = _schema_verified_key(heads)
+    if await redis_client.get(verified_key) is not None:
+        return
+
+    current = await current_revisions()
+    if current != heads:
+        raise SchemaOutOfDateError(
+            f"数据库版本 {sorted(current) or '未初始化'} 与迁移版本 {sorted(heads)} 不一致，"
+            "请运行 alembic upgrade head"
+        )
+    await redis_client.set(verified_key, "1", ex=settings.DB_SCHEMA_CHECK_TTL)
+
 
 async def init_db() -> None:
-    """Initialize database tables."""
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Verify (or, for local development, create) the database schema."""
+    mode = settings.DB_SCHEMA_CHECK
+    if mode == "create":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    elif mode != "off":
+        try:
+            await verify_schema()
+        except SchemaOutOfDateError as e:
+            if mode == "strict":
+                raise
+            logger.warning(str(e))
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -42,11 +231,47 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session on the read replica, or the primary after the caller's writes."""
+    session_maker = AsyncReadSessionLocal
+    if read_engine is not async_engine:
+        subject = _bearer_subject(request)
+        if subject is not None and await _has_recent_write(subject):
+            session_maker = AsyncSessionLocal
+
+    async with session_maker() as session:
+        session.info["read_only"] = session_maker is AsyncReadSessionLocal
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def get_db_session() -> AsyncSession:
     """Get a database session for manual management."""
     return AsyncSessionLocal()
 
 
+def pool_status() -> dict[str, dict[str, Any]]:
+    """Connection pool statistics for the primary and read engines."""
+
+    def _stats(engine: AsyncEngine) -> dict[str, Any]:
+        pool = engine.pool
+        stats: dict[str, Any] = {"status": pool.status()}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        return stats
+
+    status = {"primary": _stats(async_engine)}
+    if read_engine is not async_engine:
+        status["replica"] = _stats(read_engine)
+    return status
+
+
 async def close_db():
     """Close database connections."""
     await async_engine.dispose()
+    if read_engine is not async_engine:
+        await read_engine.dispose()
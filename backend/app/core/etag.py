@@ -0,0 +1,61 @@
+"""ETags and version counters for conditional GET."""
+
+import hashlib
+import time
+from typing import Any
+
+from fastapi import Response
+
+from app.core.redis import redis_client
+
+# Bumped on every write that changes what movie lists return.
+MOVIES_VERSION_KEY = "movies:version"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the values a representation is derived from.
+
+    Weak because the same data may be sent with different encodings.
+    """
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    """Empty 304 carrying the validator."""
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+async def current_version(key: str) -> str | None:
+    """Current value of a version counter, or None if Redis is unavailable.
+
+    Counters start from a timestamp rather than 0, so a flushed or restarted
+    Redis never hands out a version an old ETag was built from.
+    """
+    version = await redis_client.get(key)
+    if version is None and redis_client.client is not None:
+        await redis_client.set(key, str(time.time_ns()), nx=True)
+        version = await redis_client.get(key)
+    return version
+
+
+async def bump_version(key: str) -> None:
+    """Invalidate every ETag built from ``key``."""
+    if await redis_client.incr(key) == 1:
+        # The key did not exist; restart from a fresh timestamp instead.
+        await redis_client.set(key, str(time.time_ns()))
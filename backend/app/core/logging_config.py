@@ -0,0 +1,207 @@
+"""Structured, non-blocking logging with correlation ids."""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+# Correlation id of the request being served, set by CorrelationIdMiddleware.
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "trace_id",
+    "suppressed",
+}
+
+_listener: QueueListener | None = None
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the request and trace id of the emitting task.
+
+    Runs on the caller's side of the queue, where the contextvars are set.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from app.core.tracing import current_span
+
+        span = current_span.get()
+        record.request_id = request_id.get()
+        record.trace_id = span.trace_id if span is not None else None
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message template) for warnings and errors.
+
+    During an upstream outage every failed call logs the same template; only
+    ``burst`` of them per ``period`` get through, and the next record that is
+    let through carries the number suppressed in between.
+    """
+
+    def __init__(self, burst: int, period: float) -> None:
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self._buckets: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(
+                key, (float(self.burst), now, 0)
+            )
+            tokens = min(
+                self.burst, tokens + (now - updated) * self.burst / self.period
+            )
+            if tokens < 1:
+                self._buckets[key] = [tokens, now, suppressed + 1]
+                return False
+            self._buckets[key] = [tokens - 1, now, 0]
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "trace_id", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable format for local development."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.request_id = getattr(record, "request_id", None) or "-"
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", None)
+        return f"{message} (另有{suppressed}条相同日志被限流)" if suppressed else message
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback here, while args are still live
+        # objects, but leave formatting to the listener thread.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging() -> None:
+    """Route all logging through a queue drained by a background thread.
+
+    Handlers on the event loop thread only enqueue records; the actual
+    stdout write happens on the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter()
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(
+        RateLimitFilter(settings.LOG_RATE_LIMIT_BURST, settings.LOG_RATE_LIMIT_PERIOD)
+    )
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+    # Let uvicorn's loggers propagate to the queue instead of writing directly.
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers.clear()
+        logging.getLogger(name).propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class CorrelationIdMiddleware:
+    """ASGI middleware assigning each request an id used in logs and responses.
+
+    An incoming ``X-Request-ID`` header is reused so ids follow a request
+    across services.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        current = incoming[:64] if incoming else uuid.uuid4().hex
+        token = request_id.set(current)
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", current.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,161 @@
+"""Per-request SQL statement counting with slow-query and N+1 detection."""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import (
+    DB_QUERIES,
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_DURATION,
+    DB_REPEATED_STATEMENTS,
+    DB_SLOW_QUERIES,
+    DB_TIME_PER_REQUEST,
+    route_template,
+)
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed on behalf of one request."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Add one executed statement."""
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times, most frequent first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+# Stats of the request being served, set by QueryStatsMiddleware.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # A separate DBAPI cursor keeps the original result set intact and does
+    # not go back through these event hooks.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Count and time every statement executed on a SQLAlchemy engine."""
+    queries = DB_QUERIES.labels(name)
+    duration = DB_QUERY_DURATION.labels(name)
+    slow = DB_SLOW_QUERIES.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        queries.inc()
+        duration.observe(elapsed)
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        tracer.record_span("db.query", elapsed, engine=name, statement=statement)
+
+        if elapsed >= settings.DB_SLOW_QUERY_SECONDS:
+            slow.inc()
+            plan = None
+            if (
+                settings.DB_SLOW_QUERY_EXPLAIN
+                and not executemany
+                and statement.lstrip()[:6].upper() == "SELECT"
+            ):
+                plan = _explain(conn, statement, parameters)
+            logger.warning(
+                "慢查询 %.3fs [%s]: %s%s",
+                elapsed,
+                name,
+                statement,
+                f"\n{plan}" if plan else "",
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting per-request SQL counts and flagging N+1 patterns.
+
+    In debug mode the totals are also returned as ``X-DB-Query-Count`` and
+    ``X-DB-Query-Time`` (milliseconds) response headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append(
+                    (b"x-db-query-time", f"{stats.duration * 1000:.1f}".encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope, stats: QueryStats) -> None:
+        route = route_template(scope)
+        if settings.METRICS_ENABLED:
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.duration)
+
+        repeated = stats.repeated(settings.DB_REPEATED_QUERY_THRESHOLD)
+        if repeated:
+            DB_REPEATED_STATEMENTS.labels(route).inc()
+            statement, times = repeated[0]
+            logger.warning(
+                "疑似N+1查询 %s %s: 同一语句执行%d次: %s",
+                scope["method"],
+                route,
+                times,
+                statement,
+            )
@@ -1,11 +1,16 @@
 """Redis client configuration and utilities."""
 
+import logging
 from typing import Any, Optional
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from app.core.config import settings
+from app.core.metrics import REDIS_GETS
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
 
 
 class RedisClient:
@@ -26,9 +31,9 @@ class RedisClient:
             )
             # Test connection
             await self._client.ping()
-            print("Redis连接成功")
+            logger.info("Redis连接成功")
         except Exception as e:
-            print(f"Redis连接失败，将禁用缓存功能: {e}")
+            logger.warning("Redis连接失败，将禁用缓存功能: %s", e)
             self._client = None
 
     async def disconnect(self) -> None:
@@ -45,30 +50,50 @@ class RedisClient:
         """Get value from Redis."""
         if not self._client:
             return None
-        try:
-            return await self._client.get(key)
-        except Exception:
-            return None
+        namespace = key.split(":", 1)[0]
+        with tracer.span("redis.get", namespace=namespace) as span:
+            try:
+                value = await self._client.get(key)
+            except Exception:
+                REDIS_GETS.labels(namespace, "error").inc()
+                return None
+            if span is not None:
+                span.set_attribute("hit", value is not None)
+        REDIS_GETS.labels(namespace, "miss" if value is None else "hit").inc()
+        return value
 
-    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
-        """Set value in Redis."""
+    async def set(
+        self, key: str, value: str, ex: Optional[int] = None, nx: bool = False
+    ) -> bool:
+        """Set value in Redis; with ``nx``, only if the key does not exist."""
         if not self._client:
             return False
-        try:
-            await self._client.set(key, value, ex=ex)
-            return True
-        except Exception:
-            return False
+        with tracer.span("redis.set", namespace=key.split(":", 1)[0]):
+            try:
+                return bool(await self._client.set(key, value, ex=ex, nx=nx))
+            except Exception:
+                return False
+
+    async def incr(self, key: str) -> Optional[int]:
+        """Increment integer value in Redis."""
+        if not self._client:
+            return None
+        with tracer.span("redis.incr", namespace=key.split(":", 1)[0]):
+            try:
+                return await self._client.incr(key)
+            except Exception:
+                return None
 
     async def delete(self, key: str) -> bool:
         """Delete key from Redis."""
         if not self._client:
             return False
-        try:
-            await self._client.delete(key)
-            return True
-        except Exception:
-            return False
+        with tracer.span("redis.delete", namespace=key.split(":", 1)[0]):
+            try:
+                await self._client.delete(key)
+                return True
+            except Exception:
+                return False
 
 
 # Global Redis client instance
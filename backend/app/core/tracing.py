@@ -0,0 +1,277 @@
+"""Lightweight span-based request tracing."""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Any, Iterator, Protocol
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: str | None = None
+    start: float = field(default_factory=time.time)
+    duration: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializable form of the span."""
+        return asdict(self)
+
+
+class _Trace:
+    # Finished spans are buffered per trace and exported together when the
+    # root span ends, so exporters do one write per request.
+    __slots__ = ("spans",)
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+
+class SpanExporter(Protocol):
+    """Destination for finished traces."""
+
+    def export(self, spans: list[Span]) -> None:
+        ...
+
+
+class InMemoryExporter:
+    """Keeps the most recent traces for inspection through the admin API."""
+
+    def __init__(self, max_traces: int = 200) -> None:
+        self.traces: deque[list[Span]] = deque(maxlen=max_traces)
+
+    def export(self, spans: list[Span]) -> None:
+        self.traces.append(spans)
+
+    def recent(self, limit: int = 20) -> list[list[dict[str, Any]]]:
+        """Most recent traces first."""
+        traces = list(self.traces)[-limit:]
+        return [[span.to_dict() for span in spans] for spans in reversed(traces)]
+
+
+class FileExporter:
+    """Appends one JSON line per span to a local file.
+
+    ``export`` only enqueues the trace; a background thread serializes and
+    writes it, so sampled requests never wait on disk I/O.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put(spans)
+
+    def shutdown(self) -> None:
+        """Write any queued traces and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            while (spans := self._queue.get()) is not self._STOP:
+                try:
+                    file.writelines(
+                        json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+                        + "\n"
+                        for span in spans
+                    )
+                    if self._queue.empty():
+                        file.flush()
+                except OSError:
+                    logger.exception("写入追踪文件失败: %s", self.path)
+
+
+# Span of the operation currently running in this task.
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_current_trace: ContextVar[_Trace | None] = ContextVar("current_trace", default=None)
+
+
+class Tracer:
+    """Starts sampled traces and records child spans within them."""
+
+    def __init__(
+        self, exporter: SpanExporter | None = None, sample_rate: float | None = None
+    ) -> None:
+        self.exporter = exporter
+        self._sample_rate = sample_rate
+
+    @property
+    def sample_rate(self) -> float:
+        if self._sample_rate is not None:
+            return self._sample_rate
+        return settings.TRACING_SAMPLE_RATE if self.exporter is not None else 0.0
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Open a root span if this trace is sampled; yields None otherwise."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            yield None
+            return
+
+        trace = _Trace()
+        root = Span(name, trace_id=uuid.uuid4().hex, attributes=attributes)
+        trace_token = _current_trace.set(trace)
+        try:
+            with self._activate(root, trace):
+                yield root
+        finally:
+            _current_trace.reset(trace_token)
+            if self.exporter is not None:
+                self.exporter.export(trace.spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Open a child of the current span; a no-op outside a sampled trace."""
+        parent = current_span.get()
+        trace = _current_trace.get()
+        if parent is None or trace is None:
+            yield None
+            return
+
+        child = Span(
+            name,
+            trace_id=parent.trace_id,
+            parent_id=parent.span_id,
+            attributes=attributes,
+        )
+        with self._activate(child, trace):
+            yield child
+
+    def record_span(self, name: str, duration: float, **attributes: Any) -> None:
+        """Record an already-timed operation (e.g. from an event hook)."""
+        parent = current_span.get()
+        trace = _current_trace.get()
+        if parent is None or trace is None:
+            return
+        trace.spans.append(
+            Span(
+                name,
+                trace_id=parent.trace_id,
+                parent_id=parent.span_id,
+                start=time.time() - duration,
+                duration=duration,
+                attributes=attributes,
+            )
+        )
+
+    @contextmanager
+    def _activate(self, span: Span, trace: _Trace) -> Iterator[None]:
+        token = current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            current_span.reset(token)
+            trace.spans.append(span)
+
+
+def traced(name: str | None = None):
+    """Decorator running an async function inside a child span."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per sampled request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.start_trace(f"{scope['method']} {scope['path']}") as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-trace-id", root.trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                root.name = f"{scope['method']} {route_template(scope)}"
+                root.set_attribute("http.path", scope["path"])
+
+
+def _build_exporter() -> SpanExporter | None:
+    if settings.TRACING_EXPORTER == "memory":
+        return InMemoryExporter(settings.TRACING_MEMORY_TRACES)
+    if settings.TRACING_EXPORTER == "file":
+        return FileExporter(settings.TRACING_FILE)
+    return None
+
+
+# Global tracer instance
+tracer = Tracer(_build_exporter())
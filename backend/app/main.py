@@ -1,19 +1,45 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.api.v1 import auth, cast, favorites, movies
+from app.api.v1 import admin, auth, cast, favorites, images, jobs, movies
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import close_db, init_db
+from app.core.logging_config import CorrelationIdMiddleware, setup_logging
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiler import loop_lag_monitor
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.redis import redis_client
+from app.core.tracing import TracingMiddleware
+from app.services.image_service import image_service
+from app.services.job_queue import JobWorker, job_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 启动时初始化数据库
+    setup_logging()
+    # 启动时校验数据库迁移版本（校验结果通过 Redis 共享）
+    await redis_client.connect()
     await init_db()
+    if settings.LOOP_LAG_MONITOR:
+        loop_lag_monitor.start()
+    worker_task = None
+    if settings.JOB_INLINE_WORKERS > 0:
+        worker = JobWorker(job_queue, settings.JOB_INLINE_WORKERS)
+        worker_task = asyncio.create_task(worker.run())
     yield
     # 关闭时的清理工作
+    if worker_task is not None:
+        worker.stop()
+        await worker_task
+    image_service.shutdown()
+    await loop_lag_monitor.stop()
+    await redis_client.disconnect()
+    await close_db()
 
 
 app = FastAPI(
@@ -29,11 +55,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli 压缩（超过 COMPRESSION_MIN_SIZE 的文本/JSON 响应）
+app.add_middleware(CompressionMiddleware)
+
+# 按采样率记录请求链路（数据库、Redis、外部搜索）
+app.add_middleware(TracingMiddleware)
+
+# 每个请求的 SQL 次数/耗时统计与 N+1 检测
+app.add_middleware(QueryStatsMiddleware)
+
+# 请求关联 ID（X-Request-ID），写入每条日志
+app.add_middleware(CorrelationIdMiddleware)
+
+# 请求延迟与并发指标（放在最外层，计入所有中间件耗时）
+app.add_middleware(MetricsMiddleware)
+
 # 包含路由
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["认证"])
 app.include_router(movies.router, prefix="/api/v1/movies", tags=["电影"])
 app.include_router(favorites.router, prefix="/api/v1/favorites", tags=["收藏"])
 app.include_router(cast.router, prefix="/api/v1/cast", tags=["投屏"])
+app.include_router(images.router, prefix="/api/v1/images", tags=["图片"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["任务"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["管理"])
 
 
 @app.get("/")
@@ -46,6 +90,16 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 指标"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,7 +1,8 @@
 """Database models."""
 
 from app.models.favorite import Favorite
+from app.models.media_info import MediaInfo
 from app.models.movie import Movie
 from app.models.user import User
 
-__all__ = ["User", "Movie", "Favorite"]
+__all__ = ["User", "Movie", "Favorite", "MediaInfo"]
@@ -1,12 +1,24 @@
 """Base model with common fields."""
 
 from datetime import datetime
+from typing import Any, Sequence
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
+# ``insert`` with ON CONFLICT support for each of SUPPORTED_DIALECTS; engines
+# for any other dialect are rejected when they are created.
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _dialect_insert(db: AsyncSession):
+    """Dialect-specific ``insert`` that supports ``ON CONFLICT``."""
+    return _DIALECT_INSERTS[db.get_bind().dialect.name]
+
 
 class BaseModel(Base):
     """Base model class with common fields."""
@@ -26,3 +38,62 @@ class BaseModel(Base):
         nullable=False,
         comment="更新时间",
     )
+
+    @classmethod
+    async def _insert_returning(cls, db: AsyncSession, values: dict[str, Any]):
+        # INSERT ... RETURNING loads server defaults (id, timestamps) in the
+        # same round trip, so no refresh SELECT is needed after the commit.
+        return await db.scalar(insert(cls).values(**values).returning(cls))
+
+    @classmethod
+    async def create(cls, db: AsyncSession, **kwargs):
+        """Create a row with a single INSERT ... RETURNING."""
+        obj = await cls._insert_returning(db, kwargs)
+        await db.commit()
+        return obj
+
+    @classmethod
+    async def bulk_create(cls, db: AsyncSession, rows: Sequence[dict[str, Any]]):
+        """Create many rows in one multi-row INSERT ... RETURNING, in input order."""
+        if not rows:
+            return []
+        result = await db.scalars(
+            insert(cls).returning(cls, sort_by_parameter_order=True), list(rows)
+        )
+        objs = list(result.all())
+        await db.commit()
+        return objs
+
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        db: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        conflict_on: Sequence[str],
+        commit: bool = True,
+        returning: bool = True,
+    ):
+        """Insert rows, updating existing ones matched by ``conflict_on``.
+
+        Pass ``returning=False`` for large loads that do not need the rows back.
+        """
+        if not rows:
+            return []
+        stmt = _dialect_insert(db)(cls)
+        updates = {key: stmt.excluded[key] for key in rows[0] if key not in conflict_on}
+        updates["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=conflict_on, set_=updates)
+        if not returning:
+            await db.execute(stmt, list(rows))
+            if commit:
+                await db.commit()
+            return []
+        result = await db.scalars(
+            stmt.returning(cls, sort_by_parameter_order=True),
+            list(rows),
+            execution_options={"populate_existing": True},
+        )
+        objs = list(result.all())
+        if commit:
+            await db.commit()
+        return objs
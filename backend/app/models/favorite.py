@@ -1,6 +1,21 @@
 """Favorite model."""
 
-from sqlalchemy import ForeignKey, Integer, select
+from collections import Counter
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Integer,
+    and_,
+    bindparam,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,6 +27,9 @@ class Favorite(BaseModel):
     """Favorite model for user-movie relationships."""
 
     __tablename__ = "favorites"
+    __table_args__ = (
+        Index("ix_favorites_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -34,26 +52,106 @@ class Favorite(BaseModel):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def get_user_movies(cls, db: AsyncSession, user_id: int):
-        """Get all movies favorited by a user."""
-        result = await db.execute(
-            select(Movie)
+    async def get_user_movies(
+        cls,
+        db: AsyncSession,
+        user_id: int,
+        page: int = 1,
+        limit: int = 20,
+        fields: Sequence[str] | None = None,
+        after: tuple[int, datetime] | None = None,
+    ):
+        """Get a page of movies favorited by a user, newest favorite first.
+
+        Pages are addressed by ``page`` (OFFSET) or, when ``after`` is given,
+        by keyset: the (favorite id, created_at) of the previous page's last
+        row. Keyset pages cost the same at any depth and do not shift when
+        favorites are added concurrently. Returns ``(movies, total, next_key)``
+        where ``next_key`` is None on the last page.
+        """
+        # Get total count (served from the user_id/created_at index)
+        count_result = await db.execute(
+            select(func.count(cls.id)).where(cls.user_id == user_id)
+        )
+        total = count_result.scalar()
+
+        stmt = (
+            Movie.select_fields(fields)
+            .add_columns(
+                cls.id.label("favorite_id"), cls.created_at.label("favorited_at")
+            )
             .join(cls, Movie.id == cls.movie_id)
             .where(cls.user_id == user_id)
-            .order_by(cls.created_at.desc())
+            .order_by(cls.created_at.desc(), cls.id.desc())
+            .limit(limit)
         )
-        return result.scalars().all()
+        if after is None:
+            stmt = stmt.offset((page - 1) * limit)
+        else:
+            after_id, after_created_at = after
+            # Compare against the stored timestamp so its format always
+            # matches; the cursor's copy only covers a since-deleted favorite.
+            anchor = func.coalesce(
+                select(cls.created_at).where(cls.id == after_id).scalar_subquery(),
+                after_created_at,
+            )
+            stmt = stmt.where(
+                or_(
+                    cls.created_at < anchor,
+                    and_(cls.created_at == anchor, cls.id < after_id),
+                )
+            )
+
+        rows = (await db.execute(stmt)).all()
+        if fields is None:
+            movies = [row[0] for row in rows]
+        else:
+            movies = [{name: row._mapping[name] for name in fields} for row in rows]
+        next_key = None
+        if len(rows) == limit:
+            next_key = (rows[-1].favorite_id, rows[-1].favorited_at)
+        return movies, total, next_key
 
     @classmethod
     async def create(cls, db: AsyncSession, **kwargs):
-        """Create new favorite."""
-        favorite = cls(**kwargs)
-        db.add(favorite)
+        """Create new favorite and bump the movie's favorite counter."""
+        favorite = await cls._insert_returning(db, kwargs)
+        await db.execute(
+            update(Movie)
+            .where(Movie.id == favorite.movie_id)
+            .values(favorite_count=Movie.favorite_count + 1)
+        )
         await db.commit()
-        await db.refresh(favorite)
         return favorite
 
+    @classmethod
+    async def bulk_create(cls, db: AsyncSession, rows: Sequence[dict[str, Any]]):
+        """Create many favorites and bump each movie's counter once."""
+        if not rows:
+            return []
+        result = await db.scalars(
+            insert(cls).returning(cls, sort_by_parameter_order=True), list(rows)
+        )
+        favorites = list(result.all())
+        movies = Movie.__table__
+        await db.execute(
+            update(movies)
+            .where(movies.c.id == bindparam("movie_pk"))
+            .values(favorite_count=movies.c.favorite_count + bindparam("added")),
+            [
+                {"movie_pk": movie_id, "added": added}
+                for movie_id, added in Counter(f.movie_id for f in favorites).items()
+            ],
+        )
+        await db.commit()
+        return favorites
+
     async def delete(self, db: AsyncSession):
-        """Delete favorite."""
+        """Delete favorite and decrement the movie's favorite counter."""
         await db.delete(self)
+        await db.execute(
+            update(Movie)
+            .where(Movie.id == self.movie_id, Movie.favorite_count > 0)
+            .values(favorite_count=Movie.favorite_count - 1)
+        )
         await db.commit()
@@ -0,0 +1,63 @@
+"""Media info model."""
+
+from bisect import bisect_right
+
+from sqlalchemy import JSON, BigInteger, Float, ForeignKey, Integer, String, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+
+
+class MediaInfo(BaseModel):
+    """Probed technical metadata for a local movie file."""
+
+    __tablename__ = "media_info"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    movie_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+        comment="电影ID",
+    )
+    container: Mapped[str] = mapped_column(String(100), nullable=True, comment="容器格式")
+    video_codec: Mapped[str] = mapped_column(String(50), nullable=True, comment="视频编码")
+    audio_codec: Mapped[str] = mapped_column(String(50), nullable=True, comment="音频编码")
+    width: Mapped[int] = mapped_column(Integer, nullable=True, comment="宽度")
+    height: Mapped[int] = mapped_column(Integer, nullable=True, comment="高度")
+    frame_rate: Mapped[float] = mapped_column(Float, nullable=True, comment="帧率")
+    bitrate: Mapped[int] = mapped_column(BigInteger, nullable=True, comment="码率(bps)")
+    duration_seconds: Mapped[float] = mapped_column(
+        Float, nullable=True, comment="时长(秒)"
+    )
+    keyframes: Mapped[list] = mapped_column(
+        JSON, nullable=True, comment="关键帧索引 [[时间, 字节偏移], ...]"
+    )
+
+    # Relationships
+    movie: Mapped["Movie"] = relationship("Movie", back_populates="media_info")
+
+    @classmethod
+    async def get_by_movie_id(cls, db: AsyncSession, movie_id: int):
+        """Get media info for a movie."""
+        result = await db.execute(select(cls).where(cls.movie_id == movie_id))
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def upsert(cls, db: AsyncSession, movie_id: int, **kwargs):
+        """Create or replace media info for a movie."""
+        rows = await cls.bulk_upsert(
+            db, [{"movie_id": movie_id, **kwargs}], conflict_on=["movie_id"]
+        )
+        return rows[0]
+
+    def keyframe_at(self, seconds: float) -> tuple[float, int] | None:
+        """Last keyframe at or before ``seconds`` as (time, byte offset)."""
+        if not self.keyframes:
+            return None
+        times = [time for time, _ in self.keyframes]
+        index = max(bisect_right(times, seconds) - 1, 0)
+        time, offset = self.keyframes[index]
+        return time, offset
@@ -1,5 +1,7 @@
 """Movie model."""
 
+from typing import Sequence
+
 from sqlalchemy import (
     Boolean,
     Column,
@@ -14,6 +16,7 @@ from sqlalchemy import (
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.tracing import traced
 from app.models.base import BaseModel
 
 
@@ -36,27 +39,77 @@ class Movie(BaseModel):
     stream_url: Mapped[str] = mapped_column(
         String(500), nullable=True, comment="流媒体URL"
     )
+    content_hash: Mapped[str] = mapped_column(
+        String(64), index=True, nullable=True, comment="文件内容SHA-256"
+    )
+    external_id: Mapped[str] = mapped_column(
+        String(100), unique=True, index=True, nullable=True, comment="外部目录ID"
+    )
     is_local: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False, comment="是否本地文件"
     )
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=True, comment="上传用户ID"
     )
+    favorite_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        index=True,
+        comment="收藏数",
+    )
 
     # Relationships
     owner: Mapped["User"] = relationship("User", back_populates="movies")
     favorites: Mapped[list["Favorite"]] = relationship(
         "Favorite", back_populates="movie", cascade="all, delete-orphan"
     )
+    media_info: Mapped["MediaInfo"] = relationship(
+        "MediaInfo", back_populates="movie", uselist=False, cascade="all, delete-orphan"
+    )
+
+    @classmethod
+    def select_fields(cls, fields: Sequence[str] | None = None):
+        """Select whole movies, or only the named columns."""
+        if fields is None:
+            return select(cls)
+        return select(*(getattr(cls, name) for name in fields))
+
+    @staticmethod
+    def load_rows(result, fields: Sequence[str] | None = None) -> list:
+        """Rows of a select_fields() result: models, or dicts of the columns."""
+        if fields is None:
+            return list(result.scalars().all())
+        return [dict(row) for row in result.mappings()]
 
     @classmethod
-    async def get_by_id(cls, db: AsyncSession, movie_id: int):
-        """Get movie by ID."""
-        result = await db.execute(select(cls).where(cls.id == movie_id))
-        return result.scalar_one_or_none()
+    async def get_by_id(
+        cls, db: AsyncSession, movie_id: int, fields: Sequence[str] | None = None
+    ):
+        """Get movie by ID, optionally only the named columns."""
+        result = await db.execute(cls.select_fields(fields).where(cls.id == movie_id))
+        rows = cls.load_rows(result, fields)
+        return rows[0] if rows else None
 
     @classmethod
-    async def search(cls, db: AsyncSession, query: str, page: int = 1, limit: int = 20):
+    async def get_version(cls, db: AsyncSession, movie_id: int):
+        """Get just the columns a movie's ETag is derived from."""
+        result = await db.execute(
+            select(cls.updated_at, cls.favorite_count).where(cls.id == movie_id)
+        )
+        return result.one_or_none()
+
+    @classmethod
+    @traced("Movie.search")
+    async def search(
+        cls,
+        db: AsyncSession,
+        query: str,
+        page: int = 1,
+        limit: int = 20,
+        fields: Sequence[str] | None = None,
+    ):
         """Search movies by title or description."""
         offset = (page - 1) * limit
 
@@ -73,18 +126,22 @@ class Movie(BaseModel):
 
         # Get movies with pagination
         result = await db.execute(
-            select(cls)
+            cls.select_fields(fields)
             .where(search_filter)
             .offset(offset)
             .limit(limit)
             .order_by(cls.created_at.desc())
         )
-        movies = result.scalars().all()
-
-        return list(movies), total
+        return cls.load_rows(result, fields), total
 
     @classmethod
-    async def get_list(cls, db: AsyncSession, page: int = 1, limit: int = 20):
+    async def get_list(
+        cls,
+        db: AsyncSession,
+        page: int = 1,
+        limit: int = 20,
+        fields: Sequence[str] | None = None,
+    ):
         """Get movie list with pagination."""
         offset = (page - 1) * limit
 
@@ -94,17 +151,34 @@ class Movie(BaseModel):
 
         # Get movies with pagination
         result = await db.execute(
-            select(cls).offset(offset).limit(limit).order_by(cls.created_at.desc())
+            cls.select_fields(fields)
+            .offset(offset)
+            .limit(limit)
+            .order_by(cls.created_at.desc())
         )
-        movies = result.scalars().all()
-
-        return list(movies), total
+        return cls.load_rows(result, fields), total
 
     @classmethod
-    async def create(cls, db: AsyncSession, **kwargs):
-        """Create new movie."""
-        movie = cls(**kwargs)
-        db.add(movie)
-        await db.commit()
-        await db.refresh(movie)
-        return movie
+    async def get_most_favorited(
+        cls,
+        db: AsyncSession,
+        page: int = 1,
+        limit: int = 20,
+        fields: Sequence[str] | None = None,
+    ):
+        """Get movies ranked by their denormalized favorite counter."""
+        offset = (page - 1) * limit
+
+        count_result = await db.execute(
+            select(func.count(cls.id)).where(cls.favorite_count > 0)
+        )
+        total = count_result.scalar()
+
+        result = await db.execute(
+            cls.select_fields(fields)
+            .where(cls.favorite_count > 0)
+            .order_by(cls.favorite_count.desc(), cls.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return cls.load_rows(result, fields), total
@@ -43,15 +43,6 @@ class User(BaseModel):
         result = await db.execute(select(cls).where(cls.email == email))
         return result.scalar_one_or_none()
 
-    @classmethod
-    async def create(cls, db: AsyncSession, **kwargs):
-        """Create new user."""
-        user = cls(**kwargs)
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-        return user
-
     async def delete(self, db: AsyncSession):
         """Delete user."""
         await db.delete(self)
@@ -5,6 +5,7 @@ from typing import Any
 from pydantic import Field
 
 from app.schemas.base import BaseSchema, TimestampedSchema
+from app.schemas.movie import MovieList
 
 
 class FavoriteBase(BaseSchema):
@@ -35,10 +36,14 @@ class FavoriteResponse(BaseSchema):
     movie: dict | None = None
 
 
-class FavoriteListResponse(BaseSchema):
-    """Favorite list response schema."""
+class FavoriteStatus(BaseSchema):
+    """Favorite status for a single movie."""
 
-    favorites: list[FavoriteResponse]
-    total: int
-    page: int
-    limit: int
+    movie_id: int
+    is_favorite: bool
+
+
+class FavoriteMovieList(MovieList):
+    """Page of favorited movies with a keyset cursor for the next page."""
+
+    next_cursor: str | None = None
@@ -0,0 +1,21 @@
+"""Background job schemas."""
+
+from typing import Any
+
+from app.schemas.base import BaseSchema
+
+
+class JobResponse(BaseSchema):
+    """Background job status response schema."""
+
+    id: str
+    name: str
+    status: str
+    progress: float
+    message: str | None = None
+    attempts: int
+    max_retries: int
+    result: Any | None = None
+    error: str | None = None
+    created_at: float
+    updated_at: float
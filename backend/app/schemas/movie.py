@@ -1,8 +1,9 @@
 """Movie schemas."""
 
+from functools import lru_cache
 from typing import Any
 
-from pydantic import Field
+from pydantic import ConfigDict, Field, create_model
 
 from app.schemas.base import BaseSchema, TimestampedSchema
 
@@ -26,6 +27,15 @@ class MovieCreate(MovieBase):
     pass
 
 
+class CatalogRecord(MovieBase):
+    """One title from a bulk catalogue feed."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    # Required: the import upserts on it, so re-runs never duplicate a title.
+    external_id: str = Field(..., min_length=1, max_length=100)
+
+
 class MovieUpdate(BaseSchema):
     """Movie update schema."""
 
@@ -46,6 +56,8 @@ class Movie(MovieBase, TimestampedSchema):
     is_local: bool
     user_id: int | None = None
     file_path: str | None = None
+    external_id: str | None = None
+    favorite_count: int = 0
 
 
 class MovieResponse(Movie):
@@ -54,6 +66,48 @@ class MovieResponse(Movie):
     pass
 
 
+class MovieUploadResponse(BaseSchema):
+    """Movie upload response with the post-processing job."""
+
+    movie_id: int
+    job_id: str
+    movie: MovieResponse
+
+
+class MovieManifest(BaseSchema):
+    """Adaptive bitrate manifest locations for a local movie."""
+
+    movie_id: int
+    ready: bool
+    hls_url: str | None = None
+    dash_url: str | None = None
+    trickplay_url: str | None = None
+
+
+class MediaInfoResponse(BaseSchema):
+    """Probed technical metadata for a local movie."""
+
+    movie_id: int
+    container: str | None = None
+    video_codec: str | None = None
+    audio_codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    frame_rate: float | None = None
+    bitrate: int | None = None
+    duration_seconds: float | None = None
+    keyframe_count: int = 0
+
+
+class SeekPoint(BaseSchema):
+    """Keyframe to start playback from for a requested time."""
+
+    movie_id: int
+    requested_time: float
+    keyframe_time: float
+    byte_offset: int
+
+
 class MovieSearch(BaseSchema):
     """Movie search parameters."""
 
@@ -68,6 +122,8 @@ class MovieSearch(BaseSchema):
 class SearchResult(BaseSchema):
     """Search result item schema."""
 
+    model_config = ConfigDict(extra="ignore")
+
     title: str
     poster_url: str | None = None
     rating: float | None = None
@@ -97,3 +153,54 @@ class MovieList(BaseSchema):
     total: int
     page: int
     limit: int
+
+
+# Fields a ``fields=`` query may request, in response order.
+MOVIE_FIELDS = tuple(MovieResponse.model_fields)
+
+
+def parse_movie_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Validate a comma-separated ``fields=`` value.
+
+    Returns the requested fields plus ``id``, deduplicated and in schema
+    order so equal selections share ETags and cache keys, or None for the
+    full representation. Raises ValueError on unknown names.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(MOVIE_FIELDS)
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in MOVIE_FIELDS if name in requested)
+
+
+class MovieFields(BaseSchema):
+    """Base for movie responses narrowed to a subset of fields."""
+
+    model_config = ConfigDict(extra="ignore")
+
+
+@lru_cache(maxsize=256)
+def movie_schema(fields: tuple[str, ...] | None) -> type[BaseSchema]:
+    """MovieResponse, restricted to ``fields`` when given."""
+    if fields is None:
+        return MovieResponse
+    return create_model(
+        "MovieFields",
+        __base__=MovieFields,
+        **{name: (MovieResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def movie_list_schema(
+    fields: tuple[str, ...] | None, base: type[MovieList] = MovieList
+) -> type[MovieList]:
+    """``base`` (a MovieList), with items restricted to ``fields`` when given."""
+    if fields is None:
+        return base
+    return create_model(
+        "MovieFieldsList", __base__=base, movies=(list[movie_schema(fields)], ...)
+    )
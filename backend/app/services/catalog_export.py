@@ -0,0 +1,103 @@
+"""Streaming catalogue export to CSV / NDJSON."""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncReadSessionLocal
+from app.models.movie import Movie
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+EXPORT_COLUMNS = [
+    "id",
+    "external_id",
+    "title",
+    "description",
+    "poster_url",
+    "rating",
+    "year",
+    "genre",
+    "duration",
+    "stream_url",
+    "is_local",
+    "favorite_count",
+    "created_at",
+    "updated_at",
+]
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def export_filename(fmt: str, compress: bool = False) -> str:
+    """Download file name for an export."""
+    return f"movies.{fmt}" + (".gz" if compress else "")
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_csv(rows: Sequence[Sequence[Any]], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows([[_plain(value) for value in row] for row in rows])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: Sequence[Sequence[Any]]) -> bytes:
+    lines = (
+        json.dumps(
+            {name: _plain(value) for name, value in zip(EXPORT_COLUMNS, row)},
+            ensure_ascii=False,
+        )
+        for row in rows
+    )
+    return "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+
+async def _iter_encoded(fmt: str, batch_size: int) -> AsyncIterator[bytes]:
+    # Plain column tuples (not ORM objects) keep the identity map empty, and
+    # yield_per makes the driver fetch from a server-side cursor in batches,
+    # so memory stays flat however large the table is.
+    stmt = (
+        select(*(getattr(Movie, name) for name in EXPORT_COLUMNS))
+        .order_by(Movie.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(stmt)
+        if fmt == "csv":
+            yield _encode_csv([], header=True)
+        async for rows in result.partitions():
+            yield _encode_csv(rows, False) if fmt == "csv" else _encode_ndjson(rows)
+
+
+async def stream_catalog(
+    fmt: str = "ndjson", compress: bool = False, batch_size: int | None = None
+) -> AsyncIterator[bytes]:
+    """Stream every movie as CSV or NDJSON, optionally gzip-compressed."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+
+    chunks = _iter_encoded(fmt, batch_size or settings.CATALOG_EXPORT_BATCH_SIZE)
+    if not compress:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    # wbits=31 selects the gzip container, compressed one batch at a time.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
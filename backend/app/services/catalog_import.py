@@ -0,0 +1,267 @@
+"""Bulk catalogue import from CSV / NDJSON partner feeds."""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Awaitable, Callable, Iterator
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import column, false, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.etag import MOVIES_VERSION_KEY, bump_version
+from app.models.movie import Movie
+from app.schemas.movie import CatalogRecord
+from app.services.job_queue import JobContext, job_queue
+from app.services.storage_service import UPLOAD_CHUNK_SIZE, FileTooLargeError
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CATALOG = "catalog.import"
+
+CATALOG_FORMATS = ("csv", "ndjson")
+
+# Columns a feed may set; everything else on Movie is owned by the app.
+CATALOG_COLUMNS = list(CatalogRecord.model_fields)
+
+# Invalid rows are counted; only the first few are reported back.
+MAX_REPORTED_ERRORS = 20
+
+ProgressCallback = Callable[[float, "ImportResult"], Awaitable[None]]
+
+
+@dataclass
+class ImportResult:
+    """Counters for a finished (or in-progress) import."""
+
+    rows: int = 0
+    imported: int = 0  # distinct titles written, however often a feed repeats them
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializable summary."""
+        return asdict(self)
+
+
+def detect_format(path: str) -> str:
+    """Guess the feed format from a file name."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension in ("ndjson", "jsonl", "json"):
+        return "ndjson"
+    if extension in ("csv", "tsv", "txt"):
+        return "csv"
+    raise ValueError(f"无法识别的目录文件格式: {path}")
+
+
+def _iter_raw(text_stream: IO[str], fmt: str) -> Iterator[dict[str, Any] | str]:
+    # Yields parsed mappings, or an error message for unparseable lines.
+    if fmt == "csv":
+        yield from csv.DictReader(text_stream)
+        return
+    for line_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"第{line_number}行: JSON格式错误 {e.msg}"
+            continue
+        yield value if isinstance(value, dict) else f"第{line_number}行: 不是JSON对象"
+
+
+class _BatchReader:
+    """Streams validated rows from a feed in fixed-size batches."""
+
+    def __init__(self, path: str, fmt: str, batch_size: int, result: ImportResult):
+        self._binary = open(path, "rb")
+        self._size = os.fstat(self._binary.fileno()).st_size
+        # Held here so the wrapper (which closes the file) outlives the parser.
+        self._text = io.TextIOWrapper(self._binary, encoding="utf-8-sig", newline="")
+        self._records = _iter_raw(self._text, fmt)
+        self._batch_size = batch_size
+        self._result = result
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the file consumed so far."""
+        return self._binary.tell() / self._size if self._size else 1.0
+
+    def next_batch(self) -> list[dict[str, Any]]:
+        """Parse up to ``batch_size`` valid rows; an empty list means EOF."""
+        batch: dict[Any, dict[str, Any]] = {}
+        for raw in self._records:
+            self._result.rows += 1
+            row = self._validate(raw)
+            if row is None:
+                continue
+            # A statement may only touch each key once; the last row wins.
+            batch.pop(row["external_id"], None)
+            batch[row["external_id"]] = row
+            if len(batch) >= self._batch_size:
+                break
+        return list(batch.values())
+
+    def _validate(self, raw: dict[str, Any] | str) -> dict[str, Any] | None:
+        error = raw if isinstance(raw, str) else None
+        if error is None:
+            values = {
+                key.strip(): value
+                for key, value in raw.items()
+                if key is not None and value not in ("", None)
+            }
+            try:
+                return CatalogRecord.model_validate(values).model_dump()
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                error = f"第{self._result.rows}条: {location} {first['msg']}"
+
+        self._result.skipped += 1
+        if len(self._result.errors) < MAX_REPORTED_ERRORS:
+            self._result.errors.append(error)
+        return None
+
+    def close(self) -> None:
+        self._text.close()
+
+
+async def _copy_upsert(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    # COPY into a transaction-scoped staging table, then merge it in one
+    # INSERT ... SELECT ... ON CONFLICT so conflicts never abort the COPY.
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    columns = ", ".join(CATALOG_COLUMNS)
+    await db.execute(
+        text(
+            "CREATE TEMP TABLE movie_import ON COMMIT DROP AS "
+            f"SELECT {columns} FROM movies WITH NO DATA"
+        )
+    )
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "movie_import",
+        records=[tuple(row[name] for name in CATALOG_COLUMNS) for row in rows],
+        columns=CATALOG_COLUMNS,
+    )
+
+    staging = table("movie_import", *(column(name) for name in CATALOG_COLUMNS))
+    stmt = pg_insert(Movie.__table__).from_select(
+        [*CATALOG_COLUMNS, "is_local"],
+        select(*staging.columns, false()),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["external_id"],
+        set_={
+            **{name: stmt.excluded[name] for name in CATALOG_COLUMNS},
+            "updated_at": text("now()"),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def _write_batch(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    if db.get_bind().dialect.driver == "asyncpg":
+        await _copy_upsert(db, rows)
+    else:
+        await Movie.bulk_upsert(
+            db, rows, conflict_on=["external_id"], commit=False, returning=False
+        )
+    await db.commit()
+
+
+async def import_catalog(
+    path: str,
+    fmt: str | None = None,
+    batch_size: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> ImportResult:
+    """Stream a catalogue feed into ``movies``, upserting on ``external_id``.
+
+    Rows without an ``external_id`` are skipped. Each batch is committed on
+    its own, so an interrupted import can simply be re-run: rows already
+    loaded are updated in place.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in CATALOG_FORMATS:
+        raise ValueError(f"不支持的目录文件格式: {fmt}")
+
+    result = ImportResult()
+    reader = _BatchReader(
+        path, fmt, batch_size or settings.CATALOG_IMPORT_BATCH_SIZE, result
+    )
+    # Keys already written, so a title repeated across batches counts once.
+    seen: set[str] = set()
+    try:
+        async with AsyncSessionLocal() as db:
+            while rows := await asyncio.to_thread(reader.next_batch):
+                await _write_batch(db, rows)
+                await bump_version(MOVIES_VERSION_KEY)
+                keys = {row["external_id"] for row in rows}
+                result.imported += len(keys - seen)
+                seen |= keys
+                if progress is not None:
+                    await progress(reader.progress, result)
+    finally:
+        reader.close()
+
+    return result
+
+
+async def store_catalog_upload(file: UploadFile) -> str:
+    """Spool an uploaded feed to disk for the import job."""
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    directory = os.path.join(settings.UPLOAD_DIR, "imports")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4()}{extension}")
+
+    size = 0
+    try:
+        with open(path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.CATALOG_IMPORT_MAX_SIZE:
+                    raise FileTooLargeError(
+                        f"文件超过大小限制 {settings.CATALOG_IMPORT_MAX_SIZE} 字节"
+                    )
+                await asyncio.to_thread(buffer.write, chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return path
+
+
+@job_queue.task(IMPORT_CATALOG)
+async def run_catalog_import(
+    ctx: JobContext, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Import a spooled catalogue feed, reporting progress per batch."""
+
+    async def report(fraction: float, result: ImportResult) -> None:
+        await ctx.report_progress(
+            fraction, f"已导入 {result.imported} 条，跳过 {result.skipped} 条"
+        )
+
+    path = payload["path"]
+    # A retry (after an error or an expired lease) re-reads the spooled file,
+    # so only a success or the last attempt removes it.
+    last_attempt = ctx.job.attempts > ctx.job.max_retries
+    succeeded = False
+    try:
+        result = await import_catalog(path, payload.get("format"), progress=report)
+        succeeded = True
+    finally:
+        if (succeeded or last_attempt) and os.path.exists(path):
+            os.remove(path)
+    logger.info("目录导入完成: %s", result.to_dict())
+    return result.to_dict()
@@ -0,0 +1,67 @@
+"""Local ffmpeg/ffprobe process runner."""
+
+import asyncio
+import logging
+import shutil
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegError(RuntimeError):
+    """Raised when an ffmpeg or ffprobe process fails."""
+
+
+_semaphore: asyncio.Semaphore | None = None
+
+
+def _process_slots() -> asyncio.Semaphore:
+    # Bounds concurrent media processes per worker, whatever the job concurrency.
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.FFMPEG_MAX_PROCESSES)
+    return _semaphore
+
+
+def _command(binary: str, args: tuple[str, ...]) -> list[str]:
+    command = [binary, *args]
+    if settings.FFMPEG_NICE and shutil.which("nice"):
+        # Keep media processing from starving the API on shared hosts.
+        command = ["nice", "-n", str(settings.FFMPEG_NICE), *command]
+    return command
+
+
+async def run_process(binary: str, *args: str) -> bytes:
+    """Run a media binary and return its stdout."""
+    command = _command(binary, args)
+    async with _process_slots():
+        logger.debug("运行媒体进程: %s", " ".join(command))
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+
+    if process.returncode != 0:
+        message = stderr.decode(errors="replace").strip().splitlines()
+        raise FFmpegError(
+            f"{binary} exited with {process.returncode}: "
+            f"{message[-1] if message else 'no output'}"
+        )
+    return stdout
+
+
+async def run_ffmpeg(*args: str) -> bytes:
+    """Run ffmpeg with the given arguments."""
+    return await run_process(
+        settings.FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y", *args
+    )
+
+
+async def run_ffprobe(*args: str) -> bytes:
+    """Run ffprobe with the given arguments."""
+    return await run_process(
+        settings.FFPROBE_BINARY, "-hide_banner", "-loglevel", "error", *args
+    )
@@ -0,0 +1,174 @@
+"""Poster image proxy with resized WebP variants and a disk cache."""
+
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+from app.core.cache import DiskLRUCache
+from app.core.config import settings
+from app.core.metrics import track_upstream
+
+# Variant name -> target width in pixels
+POSTER_SIZES: dict[str, int] = {
+    "thumbnail": 160,
+    "card": 342,
+    "detail": 780,
+}
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 3
+
+
+class ImageFetchError(RuntimeError):
+    """Raised when an upstream poster cannot be fetched."""
+
+
+class ImageSourceNotAllowedError(ValueError):
+    """Raised for poster URLs outside ``settings.IMAGE_PROXY_ALLOWED_HOSTS``."""
+
+
+def _resize_to_webp(data: bytes, width: int, quality: int) -> bytes:
+    # Runs in a worker process; Pillow is only needed by the image pool.
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=quality, method=4)
+        return output.getvalue()
+
+
+class ImageService:
+    """Fetches posters once and serves cached size variants."""
+
+    def __init__(self) -> None:
+        self.cache = DiskLRUCache(
+            settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_BYTES, suffix=".img"
+        )
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            # Douban rejects image requests without a movie.douban.com referer.
+            "Referer": "https://movie.douban.com/",
+        }
+        self._pool: ProcessPoolExecutor | None = None
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Process pool used for decoding and encoding images."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=settings.IMAGE_PROCESS_WORKERS)
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the image process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def check_source(url: str) -> None:
+        """Reject URLs that are not http(s) on an allowed host."""
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        allowed = any(
+            host == allowed_host or host.endswith(f".{allowed_host}")
+            for allowed_host in settings.IMAGE_PROXY_ALLOWED_HOSTS
+        )
+        if parsed.scheme not in ("http", "https") or not allowed:
+            raise ImageSourceNotAllowedError(f"不允许代理的图片地址: {url}")
+
+    async def get_variant_path(self, url: str, size: str) -> str:
+        """Return the cached file for a poster variant, producing it if needed."""
+        key = f"variant:{size}:{url}"
+        path = await asyncio.to_thread(self.cache.get_path, key)
+        if path is not None:
+            return path
+
+        # Concurrent requests for the same variant share one fetch/resize.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._produce_variant(key, url, size))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _produce_variant(self, key: str, url: str, size: str) -> str:
+        original = await self._get_original(url)
+        loop = asyncio.get_running_loop()
+        try:
+            variant = await loop.run_in_executor(
+                self.pool,
+                _resize_to_webp,
+                original,
+                POSTER_SIZES[size],
+                settings.IMAGE_WEBP_QUALITY,
+            )
+        except Exception as e:
+            raise ImageFetchError(f"无法处理图片: {e}") from e
+        return await asyncio.to_thread(self.cache.set, key, variant)
+
+    async def _get_original(self, url: str) -> bytes:
+        key = f"original:{url}"
+        data = await asyncio.to_thread(self.cache.get, key)
+        if data is not None:
+            return data
+
+        data = await self._fetch(url)
+        await asyncio.to_thread(self.cache.set, key, data)
+        return data
+
+    async def _fetch(self, url: str) -> bytes:
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(total=settings.IMAGE_FETCH_TIMEOUT)
+        try:
+            with track_upstream("poster"):
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    # Redirects are followed by hand so every hop is checked
+                    # against the allow-list; otherwise an allowed host could
+                    # point the proxy at any URL.
+                    for _ in range(MAX_REDIRECTS + 1):
+                        async with session.get(
+                            url, headers=self.headers, allow_redirects=False
+                        ) as response:
+                            if response.status in REDIRECT_STATUSES:
+                                url = self._redirect_target(url, response)
+                                continue
+                            return await self._read_body(response)
+        except aiohttp.ClientError as e:
+            raise ImageFetchError(f"获取图片失败: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise ImageFetchError("获取图片超时") from e
+        raise ImageFetchError("图片重定向次数过多")
+
+    def _redirect_target(self, url: str, response) -> str:
+        location = response.headers.get("Location")
+        if not location:
+            raise ImageFetchError(f"上游返回状态码 {response.status}")
+        target = urljoin(url, location)
+        try:
+            self.check_source(target)
+        except ImageSourceNotAllowedError as e:
+            raise ImageFetchError(f"上游重定向到不允许的地址: {target}") from e
+        return target
+
+    @staticmethod
+    async def _read_body(response) -> bytes:
+        if response.status != 200:
+            raise ImageFetchError(f"上游返回状态码 {response.status}")
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            if size > settings.IMAGE_MAX_BYTES:
+                raise ImageFetchError("图片过大")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+# Global image service instance
+image_service = ImageService()
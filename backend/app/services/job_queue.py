@@ -0,0 +1,434 @@
+"""Background job queue service."""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueUnavailableError(RuntimeError):
+    """Raised when the configured Redis backend cannot be reached."""
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of background work and its progress."""
+
+    name: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    priority: int = 0
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_retries: int = 0
+    progress: float = 0.0
+    message: str | None = None
+    result: Any = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    run_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        """Serialize the job for storage."""
+        data = asdict(self)
+        data["status"] = self.status.value
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Job":
+        """Deserialize a stored job."""
+        data = json.loads(raw)
+        data["status"] = JobStatus(data["status"])
+        return cls(**data)
+
+
+class JobBackend(Protocol):
+    """Storage and ordering for queued jobs."""
+
+    async def save(self, job: Job) -> None:
+        ...
+
+    async def load(self, job_id: str) -> Job | None:
+        ...
+
+    async def push(self, job: Job) -> None:
+        ...
+
+    async def pop(self, timeout: float) -> str | None:
+        ...
+
+    async def touch(self, job_id: str) -> None:
+        ...
+
+    async def ack(self, job_id: str) -> None:
+        ...
+
+
+class InMemoryJobBackend:
+    """Process-local backend, used by tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._ready: list[tuple[int, int, str]] = []
+        self._delayed: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def load(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def push(self, job: Job) -> None:
+        if job.run_at > time.time():
+            heapq.heappush(self._delayed, (job.run_at, next(self._counter), job.id))
+        else:
+            heapq.heappush(self._ready, (-job.priority, next(self._counter), job.id))
+        self._wakeup.set()
+
+    async def pop(self, timeout: float) -> str | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            self._promote_due()
+            if self._ready:
+                return heapq.heappop(self._ready)[2]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self._delayed:
+                remaining = min(remaining, max(self._delayed[0][0] - time.time(), 0))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def touch(self, job_id: str) -> None:
+        # Jobs die with the process, so there is nothing to lease.
+        pass
+
+    async def ack(self, job_id: str) -> None:
+        pass
+
+    def _promote_due(self) -> None:
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, job_id = heapq.heappop(self._delayed)
+            job = self._jobs[job_id]
+            heapq.heappush(self._ready, (-job.priority, next(self._counter), job_id))
+
+
+class RedisJobBackend:
+    """Redis-backed backend shared by the API and worker processes.
+
+    Popped jobs are leased in a processing set scored by their deadline
+    until acked. A job whose worker died is requeued once its lease
+    expires, so delivery is at-least-once.
+    """
+
+    JOB_KEY = "jobs:data:{job_id}"
+    READY_KEY = "jobs:ready"
+    DELAYED_KEY = "jobs:delayed"
+    PROCESSING_KEY = "jobs:processing"
+    # Pop and lease in one step, so a crash in between cannot lose the job.
+    POP_SCRIPT = """
+local item = redis.call('ZPOPMIN', KEYS[1])
+if item[1] then
+    redis.call('ZADD', KEYS[2], ARGV[1], item[1])
+    return item[1]
+end
+return false
+"""
+
+    @property
+    def _client(self):
+        client = redis_client.client
+        if client is None:
+            raise JobQueueUnavailableError("Redis不可用，任务队列暂时无法使用")
+        return client
+
+    @staticmethod
+    def _score(job: Job) -> float:
+        # Lower scores pop first: higher priority wins, then FIFO by creation.
+        return job.created_at - job.priority * 1e10
+
+    async def save(self, job: Job) -> None:
+        await self._client.set(
+            self.JOB_KEY.format(job_id=job.id),
+            job.to_json(),
+            ex=settings.JOB_RESULT_TTL,
+        )
+
+    async def load(self, job_id: str) -> Job | None:
+        raw = await self._client.get(self.JOB_KEY.format(job_id=job_id))
+        return Job.from_json(raw) if raw else None
+
+    async def push(self, job: Job) -> None:
+        if job.run_at > time.time():
+            await self._client.zadd(self.DELAYED_KEY, {job.id: job.run_at})
+        else:
+            await self._client.zadd(self.READY_KEY, {job.id: self._score(job)})
+
+    async def pop(self, timeout: float) -> str | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            await self._promote_due()
+            job_id = await self._client.eval(
+                self.POP_SCRIPT,
+                2,
+                self.READY_KEY,
+                self.PROCESSING_KEY,
+                time.time() + settings.JOB_LEASE_SECONDS,
+            )
+            if job_id is not None:
+                return job_id
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(settings.JOB_POLL_INTERVAL, remaining))
+
+    async def touch(self, job_id: str) -> None:
+        await self._client.zadd(
+            self.PROCESSING_KEY,
+            {job_id: time.time() + settings.JOB_LEASE_SECONDS},
+            xx=True,
+        )
+
+    async def ack(self, job_id: str) -> None:
+        await self._client.zrem(self.PROCESSING_KEY, job_id)
+
+    async def _promote_due(self) -> None:
+        now = time.time()
+        due = await self._client.zrangebyscore(self.DELAYED_KEY, "-inf", now)
+        for job_id in due:
+            # zrem succeeds for exactly one worker, so a job is promoted once.
+            if await self._client.zrem(self.DELAYED_KEY, job_id):
+                job = await self.load(job_id)
+                if job is not None:
+                    await self._client.zadd(self.READY_KEY, {job_id: self._score(job)})
+
+        expired = await self._client.zrangebyscore(self.PROCESSING_KEY, "-inf", now)
+        for job_id in expired:
+            if await self._client.zrem(self.PROCESSING_KEY, job_id):
+                await self._requeue_expired(job_id)
+
+    async def _requeue_expired(self, job_id: str) -> None:
+        job = await self.load(job_id)
+        if job is None or job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+            return
+        job.updated_at = time.time()
+        if job.attempts > job.max_retries:
+            job.status = JobStatus.FAILED
+            job.error = "Lease expired: worker stopped while running the job"
+            logger.error("任务 %s (%s) 租约过期且已无重试次数", job.id, job.name)
+            await self.save(job)
+            return
+        job.status = JobStatus.QUEUED
+        logger.warning("任务 %s (%s) 租约过期，重新入队", job.id, job.name)
+        await self.save(job)
+        await self._client.zadd(self.READY_KEY, {job_id: self._score(job)})
+
+
+class JobContext:
+    """Handle passed to job handlers for progress reporting."""
+
+    def __init__(self, queue: "JobQueue", job: Job) -> None:
+        self.queue = queue
+        self.job = job
+
+    async def report_progress(
+        self, progress: float, message: str | None = None
+    ) -> None:
+        """Record handler progress in the range 0.0 - 1.0."""
+        self.job.progress = max(0.0, min(progress, 1.0))
+        if message is not None:
+            self.job.message = message
+        self.job.updated_at = time.time()
+        await self.queue.backend.save(self.job)
+        # Progress doubles as a heartbeat that keeps the job leased.
+        await self.queue.backend.touch(self.job.id)
+
+
+JobHandler = Callable[[JobContext, dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueue:
+    """Priority job queue with retries and progress reporting."""
+
+    def __init__(self, backend: Optional[JobBackend] = None) -> None:
+        self._backend = backend
+        self.handlers: dict[str, JobHandler] = {}
+
+    @property
+    def backend(self) -> JobBackend:
+        """Resolve the configured backend on first use.
+
+        Raises JobQueueUnavailableError while the Redis backend is configured
+        but not connected: falling back to memory would accept jobs that no
+        worker process can see and that vanish on restart.
+        """
+        if self._backend is None:
+            if settings.JOB_QUEUE_BACKEND == "memory":
+                self._backend = InMemoryJobBackend()
+            elif redis_client.client is None:
+                raise JobQueueUnavailableError("Redis不可用，任务队列暂时无法使用")
+            else:
+                self._backend = RedisJobBackend()
+        return self._backend
+
+    def check_available(self) -> None:
+        """Raise JobQueueUnavailableError unless jobs can be queued now."""
+        self.backend
+
+    def task(self, name: str) -> Callable[[JobHandler], JobHandler]:
+        """Register a coroutine as the handler for jobs called ``name``."""
+
+        def decorator(handler: JobHandler) -> JobHandler:
+            self.handlers[name] = handler
+            return handler
+
+        return decorator
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict[str, Any] | None = None,
+        priority: int = 0,
+        max_retries: int | None = None,
+    ) -> Job:
+        """Queue a job and return it immediately."""
+        job = Job(
+            name=name,
+            payload=payload or {},
+            priority=priority,
+            max_retries=(
+                settings.JOB_MAX_RETRIES if max_retries is None else max_retries
+            ),
+        )
+        await self.backend.save(job)
+        await self.backend.push(job)
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        """Get a job by ID."""
+        return await self.backend.load(job_id)
+
+    async def run_next(self, timeout: float = 1.0) -> Job | None:
+        """Pop and execute a single job, returning it once it has settled."""
+        job_id = await self.backend.pop(timeout)
+        if job_id is None:
+            return None
+        job = await self.backend.load(job_id)
+        if job is None:
+            await self.backend.ack(job_id)
+            return None
+        await self._execute(job)
+        # Not acked if _execute raised: the lease expires and the job is retried.
+        await self.backend.ack(job_id)
+        return job
+
+    async def _execute(self, job: Job) -> None:
+        handler = self.handlers.get(job.name)
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        await self.backend.save(job)
+
+        # Renew the lease while the handler runs, so long stages that report
+        # no progress (e.g. one ffmpeg call) are not delivered twice.
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job.name!r}")
+            job.result = await handler(JobContext(self, job), job.payload)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            if job.attempts <= job.max_retries:
+                delay = settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+                job.status = JobStatus.RETRYING
+                job.run_at = time.time() + delay
+                logger.warning(
+                    "任务 %s (%s) 第%d次执行失败，%.1f秒后重试: %s",
+                    job.id,
+                    job.name,
+                    job.attempts,
+                    delay,
+                    job.error,
+                )
+            else:
+                job.status = JobStatus.FAILED
+                logger.error("任务 %s (%s) 执行失败: %s", job.id, job.name, job.error)
+        else:
+            job.status = JobStatus.SUCCEEDED
+            job.progress = 1.0
+            job.error = None
+        finally:
+            heartbeat.cancel()
+
+        job.updated_at = time.time()
+        await self.backend.save(job)
+        if job.status == JobStatus.RETRYING:
+            await self.backend.push(job)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        interval = settings.JOB_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.backend.touch(job_id)
+            except Exception as e:
+                # A missed renewal is retried next beat; the lease has slack.
+                logger.warning("任务 %s 续租失败: %s", job_id, e)
+
+
+class JobWorker:
+    """Runs queued jobs with bounded concurrency until stopped."""
+
+    def __init__(self, queue: JobQueue, concurrency: int = 1) -> None:
+        self.queue = queue
+        self.concurrency = concurrency
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        """Process jobs until ``stop`` is called."""
+        await asyncio.gather(*(self._loop() for _ in range(self.concurrency)))
+
+    def stop(self) -> None:
+        """Ask the worker loops to exit after their current job."""
+        self._stopping.set()
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.queue.run_next(timeout=1.0)
+            except Exception:
+                logger.exception("任务队列轮询失败")
+                await asyncio.sleep(1.0)
+
+
+# Global job queue instance
+job_queue = JobQueue()
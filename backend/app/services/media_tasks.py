@@ -0,0 +1,150 @@
+"""Background media processing tasks for uploaded movies."""
+
+import logging
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.etag import MOVIES_VERSION_KEY, bump_version
+from app.models.media_info import MediaInfo
+from app.models.movie import Movie
+from app.services.job_queue import JobContext, job_queue
+from app.services.packaging_service import package_movie
+from app.services.probe_service import probe_file
+from app.services.thumbnail_service import POSTER_NAME, extract_poster
+from app.services.trickplay_service import generate_trickplay
+
+logger = logging.getLogger(__name__)
+
+PROCESS_UPLOAD = "media.process_upload"
+EXTRACT_POSTER = "media.extract_poster"
+
+# Backfill jobs yield to fresh uploads.
+BACKFILL_PRIORITY = -10
+
+# Stages receive the results of earlier stages (e.g. probed duration).
+UploadStage = Callable[
+    [JobContext, Movie, dict[str, Any]], Awaitable[dict[str, Any] | None]
+]
+
+
+def local_media_url(movie_id: int, asset_name: str) -> str:
+    """Public URL of a derived media asset for a local movie."""
+    return f"{settings.API_V1_STR}/movies/{movie_id}/media/{asset_name}"
+
+
+async def _load_local_movie(movie_id: int) -> Movie:
+    async with AsyncSessionLocal() as db:
+        movie = await Movie.get_by_id(db, movie_id)
+    if movie is None or not movie.file_path:
+        raise LookupError(f"电影 {movie_id} 不存在或没有本地文件")
+    return movie
+
+
+async def probe_stage(
+    ctx: JobContext, movie: Movie, result: dict[str, Any]
+) -> dict[str, Any]:
+    """Record container, codecs, resolution, bitrate and keyframes."""
+    info = await probe_file(movie.file_path)
+    async with AsyncSessionLocal() as db:
+        await MediaInfo.upsert(db, movie.id, **info)
+        if info["duration_seconds"]:
+            await db.execute(
+                update(Movie)
+                .where(Movie.id == movie.id, Movie.duration.is_(None))
+                .values(duration=max(round(info["duration_seconds"] / 60), 1))
+            )
+            await db.commit()
+            await bump_version(MOVIES_VERSION_KEY)
+    return {
+        "duration_seconds": info["duration_seconds"],
+        "height": info["height"],
+        "keyframes": len(info["keyframes"]),
+    }
+
+
+async def poster_stage(
+    ctx: JobContext, movie: Movie, result: dict[str, Any]
+) -> dict[str, Any]:
+    """Extract a poster and thumbnails, filling in a missing poster_url."""
+    await extract_poster(movie.file_path, result.get("duration_seconds"))
+    poster_url = local_media_url(movie.id, POSTER_NAME)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Movie)
+            .where(Movie.id == movie.id, Movie.poster_url.is_(None))
+            .values(poster_url=poster_url)
+        )
+        await db.commit()
+    await bump_version(MOVIES_VERSION_KEY)
+    return {"poster_url": poster_url}
+
+
+async def packaging_stage(
+    ctx: JobContext, movie: Movie, result: dict[str, Any]
+) -> dict[str, Any]:
+    """Segment the file into adaptive bitrate HLS/DASH renditions."""
+    await package_movie(movie.file_path, result.get("height"))
+    return {"packaged": True}
+
+
+async def trickplay_stage(
+    ctx: JobContext, movie: Movie, result: dict[str, Any]
+) -> dict[str, Any]:
+    """Render seek-preview sprite sheets and their WebVTT track."""
+    await generate_trickplay(movie.file_path, result.get("duration_seconds"))
+    return {"trickplay": True}
+
+
+# Stages run in order; each may return values merged into the job result.
+# The content hash is computed inline while the upload is written.
+UPLOAD_STAGES: list[tuple[str, UploadStage]] = [
+    ("probe", probe_stage),
+    ("poster", poster_stage),
+    ("trickplay", trickplay_stage),
+    ("packaging", packaging_stage),
+]
+
+
+@job_queue.task(PROCESS_UPLOAD)
+async def process_upload(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Run the post-upload pipeline for a local movie."""
+    movie = await _load_local_movie(payload["movie_id"])
+
+    result: dict[str, Any] = {}
+    for index, (name, stage) in enumerate(UPLOAD_STAGES):
+        await ctx.report_progress(index / len(UPLOAD_STAGES), f"{name}...")
+        result.update(await stage(ctx, movie, result) or {})
+
+    return result
+
+
+@job_queue.task(EXTRACT_POSTER)
+async def extract_movie_poster(
+    ctx: JobContext, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Extract the poster for a single existing local movie."""
+    movie = await _load_local_movie(payload["movie_id"])
+    async with AsyncSessionLocal() as db:
+        media_info = await MediaInfo.get_by_movie_id(db, movie.id)
+    result = {"duration_seconds": media_info.duration_seconds if media_info else None}
+    return await poster_stage(ctx, movie, result)
+
+
+async def enqueue_poster_backfill() -> list[str]:
+    """Queue poster extraction for every local movie without a poster."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Movie.id).where(Movie.is_local.is_(True), Movie.poster_url.is_(None))
+        )
+        movie_ids = result.scalars().all()
+
+    job_ids = []
+    for movie_id in movie_ids:
+        job = await job_queue.enqueue(
+            EXTRACT_POSTER, {"movie_id": movie_id}, priority=BACKFILL_PRIORITY
+        )
+        job_ids.append(job.id)
+    return job_ids
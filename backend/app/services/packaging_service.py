@@ -0,0 +1,131 @@
+"""Adaptive bitrate packaging of local movies into HLS and DASH."""
+
+import os
+import shutil
+import uuid
+
+from app.core.config import settings
+from app.services.ffmpeg import run_ffmpeg
+from app.services.storage_service import media_dir
+
+HLS_MASTER = "master.m3u8"
+DASH_MANIFEST = "manifest.mpd"
+
+# height -> (video bitrate, audio bitrate)
+BITRATE_LADDER: dict[int, tuple[str, str]] = {
+    2160: ("14000k", "192k"),
+    1440: ("8000k", "192k"),
+    1080: ("5000k", "192k"),
+    720: ("2800k", "128k"),
+    480: ("1400k", "128k"),
+    360: ("800k", "96k"),
+    240: ("400k", "64k"),
+}
+
+
+def package_dir(file_path: str) -> str:
+    """Directory holding the packaged renditions for a stored file."""
+    return os.path.join(media_dir(file_path), "stream")
+
+
+def is_packaged(file_path: str) -> bool:
+    """Whether both manifests exist for a stored file."""
+    directory = package_dir(file_path)
+    return os.path.exists(os.path.join(directory, HLS_MASTER)) and os.path.exists(
+        os.path.join(directory, DASH_MANIFEST)
+    )
+
+
+def _rendition_heights(source_height: int | None) -> list[int]:
+    heights = sorted(
+        (h for h in settings.PACKAGING_RENDITIONS if h in BITRATE_LADDER),
+        reverse=True,
+    )
+    if source_height:
+        # Never upscale; always keep at least the smallest rendition.
+        heights = [h for h in heights if h <= source_height] or heights[-1:]
+    return heights
+
+
+def build_ffmpeg_args(
+    input_path: str, output_dir: str, source_height: int | None = None
+) -> list[str]:
+    """Build one ffmpeg invocation emitting CMAF segments for HLS and DASH."""
+    heights = _rendition_heights(source_height)
+    args = ["-i", input_path]
+
+    for _ in heights:
+        args += ["-map", "0:v:0"]
+    args += ["-map", "0:a:0?"]
+
+    args += [
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-profile:v",
+        "main",
+        # Keyframe on every segment boundary, independent of frame rate.
+        "-force_key_frames",
+        f"expr:gte(t,n_forced*{settings.HLS_SEGMENT_SECONDS})",
+        "-sc_threshold",
+        "0",
+    ]
+    for index, height in enumerate(heights):
+        video_bitrate, _ = BITRATE_LADDER[height]
+        args += [
+            f"-filter:v:{index}",
+            f"scale=-2:{height}",
+            f"-b:v:{index}",
+            video_bitrate,
+            f"-maxrate:v:{index}",
+            video_bitrate,
+            f"-bufsize:v:{index}",
+            video_bitrate,
+        ]
+
+    _, audio_bitrate = BITRATE_LADDER[heights[0]]
+    args += ["-c:a", "aac", "-b:a", audio_bitrate, "-ac", "2"]
+
+    args += [
+        "-f",
+        "dash",
+        "-seg_duration",
+        str(settings.HLS_SEGMENT_SECONDS),
+        "-use_template",
+        "1",
+        "-use_timeline",
+        "1",
+        "-hls_playlist",
+        "1",
+        "-hls_master_name",
+        HLS_MASTER,
+        "-adaptation_sets",
+        "id=0,streams=v id=1,streams=a",
+        "-init_seg_name",
+        "init-$RepresentationID$.m4s",
+        "-media_seg_name",
+        "chunk-$RepresentationID$-$Number%05d$.m4s",
+        os.path.join(output_dir, DASH_MANIFEST),
+    ]
+    return args
+
+
+async def package_movie(file_path: str, source_height: int | None = None) -> str:
+    """Segment a stored file into HLS/DASH renditions next to it."""
+    target = package_dir(file_path)
+    if is_packaged(file_path):
+        return target
+
+    # Package into a scratch directory so readers never see partial output.
+    scratch = f"{target}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(scratch)
+    try:
+        await run_ffmpeg(*build_ffmpeg_args(file_path, scratch, source_height))
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(scratch, target)
+    finally:
+        if os.path.exists(scratch):
+            shutil.rmtree(scratch, ignore_errors=True)
+    return target
@@ -0,0 +1,89 @@
+"""Media probing with ffprobe."""
+
+import json
+from typing import Any
+
+from app.services.ffmpeg import run_ffprobe
+
+
+def _frame_rate(value: str | None) -> float | None:
+    if not value or value == "0/0":
+        return None
+    numerator, _, denominator = value.partition("/")
+    try:
+        return round(float(numerator) / float(denominator or 1), 3)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_probe(data: dict[str, Any]) -> dict[str, Any]:
+    """Extract MediaInfo fields from ``ffprobe -show_format -show_streams`` JSON."""
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+    fmt = data.get("format", {})
+    duration = fmt.get("duration") or video.get("duration")
+
+    return {
+        "container": fmt.get("format_name"),
+        "video_codec": video.get("codec_name"),
+        "audio_codec": audio.get("codec_name"),
+        "width": _int(video.get("width")),
+        "height": _int(video.get("height")),
+        "frame_rate": _frame_rate(video.get("avg_frame_rate")),
+        "bitrate": _int(fmt.get("bit_rate")),
+        "duration_seconds": float(duration) if duration else None,
+    }
+
+
+def parse_keyframes(output: str) -> list[list[float | int]]:
+    """Parse ``pts_time,pos,flags`` CSV rows into [[time, byte offset], ...]."""
+    keyframes = []
+    for line in output.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) < 3 or "K" not in parts[2]:
+            continue
+        try:
+            keyframes.append([float(parts[0]), int(parts[1])])
+        except ValueError:
+            # Packets without a timestamp or position (N/A) can't be seek targets.
+            continue
+    keyframes.sort()
+    return keyframes
+
+
+async def probe_duration(file_path: str) -> float | None:
+    """Container duration in seconds, if ffprobe can tell."""
+    output = await run_ffprobe(
+        "-show_entries", "format=duration", "-of", "json", file_path
+    )
+    duration = json.loads(output).get("format", {}).get("duration")
+    return float(duration) if duration else None
+
+
+async def probe_file(file_path: str) -> dict[str, Any]:
+    """Probe container, codecs, resolution, bitrate and the keyframe index."""
+    output = await run_ffprobe(
+        "-show_format", "-show_streams", "-of", "json", file_path
+    )
+    info = parse_probe(json.loads(output))
+
+    # Packet flags carry the keyframe marker, so no frames need decoding.
+    packets = await run_ffprobe(
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,pos,flags",
+        "-of",
+        "csv=p=0",
+        file_path,
+    )
+    info["keyframes"] = parse_keyframes(packets.decode())
+    return info
@@ -2,16 +2,20 @@
 
 import asyncio
 import json
+import logging
 import re
 from typing import Any
 
-import aiohttp
-from bs4 import BeautifulSoup
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.tracing import traced, tracer
 from app.models.movie import Movie
 
+logger = logging.getLogger(__name__)
+
 
 class MovieSearchService:
     """Service for searching movies from multiple sources."""
@@ -21,6 +25,7 @@ class MovieSearchService:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
+    @traced("search.federated")
     async def search_movies(
         self, query: str, page: int = 1, db: AsyncSession | None = None
     ) -> dict[str, Any]:
@@ -63,14 +68,20 @@ class MovieSearchService:
             "has_prev": page > 1,
         }
 
+    @traced("search.douban")
     async def _search_douban(self, query: str, page: int) -> list[dict[str, Any]]:
         """Search from Douban movies."""
-        try:
-            url = f"https://movie.douban.com/j/subject_suggest?q={query}"
+        import aiohttp
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
+        try:
+            url = f"{settings.DOUBAN_BASE_URL}/j/subject_suggest"
+
+            with track_upstream("douban"):
+                async with aiohttp.ClientSession(timeout=self._timeout()) as session:
+                    async with session.get(
+                        url, params={"q": query}, headers=self.headers
+                    ) as response:
+                        response.raise_for_status()
                         data = await response.json()
                         results = []
 
@@ -87,10 +98,11 @@ class MovieSearchService:
 
                         return results
         except Exception as e:
-            print(f"Douban search error: {e}")
+            logger.warning("Douban search error: %s", e)
 
         return []
 
+    @traced("search.online")
     async def _search_online_movies(
         self, query: str, page: int
     ) -> list[dict[str, Any]]:
@@ -112,20 +124,31 @@ class MovieSearchService:
             ]
             return mock_results
         except Exception as e:
-            print(f"Online movie search error: {e}")
+            logger.warning("Online movie search error: %s", e)
 
         return []
 
+    @traced("search.youtube")
     async def _search_youtube(self, query: str, page: int) -> list[dict[str, Any]]:
         """Search from YouTube for movie trailers."""
-        try:
-            search_url = f"https://www.youtube.com/results?search_query={query}+trailer"
+        # Scraping dependencies are only loaded when a search actually runs.
+        import aiohttp
+        from bs4 import BeautifulSoup
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, headers=self.headers) as response:
-                    if response.status == 200:
+        try:
+            search_url = f"{settings.YOUTUBE_BASE_URL}/results"
+
+            with track_upstream("youtube"):
+                async with aiohttp.ClientSession(timeout=self._timeout()) as session:
+                    async with session.get(
+                        search_url,
+                        params={"search_query": f"{query} trailer"},
+                        headers=self.headers,
+                    ) as response:
+                        response.raise_for_status()
                         html = await response.text()
-                        soup = BeautifulSoup(html, "html.parser")
+                        with tracer.span("search.youtube.parse", bytes=len(html)):
+                            soup = BeautifulSoup(html, "html.parser")
                         results = []
 
                         # Parse YouTube search results
@@ -150,10 +173,11 @@ class MovieSearchService:
 
                         return results
         except Exception as e:
-            print(f"YouTube search error: {e}")
+            logger.warning("YouTube search error: %s", e)
 
         return []
 
+    @traced("search.local")
     async def _search_local_database(
         self, query: str, db: AsyncSession
     ) -> list[dict[str, Any]]:
@@ -183,9 +207,14 @@ class MovieSearchService:
 
             return results
         except Exception as e:
-            print(f"Local database search error: {e}")
+            logger.exception("Local database search error: %s", e)
             return []
 
+    def _timeout(self):
+        import aiohttp
+
+        return aiohttp.ClientTimeout(total=settings.SEARCH_UPSTREAM_TIMEOUT)
+
     def _deduplicate_results(
         self, results: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
@@ -216,3 +245,7 @@ class MovieSearchService:
         except (ValueError, TypeError):
             pass
         return None
+
+
+# Global search service instance
+search_service = MovieSearchService()
@@ -0,0 +1,121 @@
+"""Two-tier cache for video segments and byte ranges of local movies."""
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable
+
+from app.core.cache import DiskLRUCache, MemoryLRUCache
+from app.core.config import settings
+
+# Block keys remembered for second-hit admission.
+ADMISSION_HISTORY = 65536
+
+
+class SegmentCache:
+    """Memory + local disk cache for fixed-size blocks and whole segments.
+
+    Packaged segments are always cached. Byte-range blocks past the head of a
+    file are only admitted once requested twice, so a single full playback
+    or download streams through without evicting the hot set.
+    """
+
+    def __init__(self) -> None:
+        self.memory = MemoryLRUCache(settings.SEGMENT_CACHE_MEMORY_BYTES)
+        self.disk = DiskLRUCache(
+            settings.SEGMENT_CACHE_DIR, settings.SEGMENT_CACHE_DISK_BYTES
+        )
+        self.block_size = settings.SEGMENT_CACHE_BLOCK_SIZE
+        self._inflight: dict[str, asyncio.Task[bytes]] = {}
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Get a cached value, loading it once even under concurrent misses."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            # The load runs in its own task, so a requester that is cancelled
+            # (a client disconnecting mid-stream) does not cancel it for the
+            # other waiters; the result is still cached.
+            task = asyncio.create_task(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._load_done(key, done))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        value = await asyncio.to_thread(self.disk.get, key)
+        if value is None:
+            value = await loader()
+            await asyncio.to_thread(self.disk.set, key, value)
+        self.memory.set(key, value)
+        return value
+
+    def _load_done(self, key: str, task: asyncio.Task[bytes]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody awaited is not logged as lost.
+            task.exception()
+
+    @staticmethod
+    def _file_key(path: str) -> str:
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    async def read_file(self, path: str) -> bytes:
+        """Read a whole (small) file such as a packaged segment through the cache."""
+        key = f"file:{self._file_key(path)}"
+        return await self.get(key, lambda: asyncio.to_thread(_read_block, path, 0, -1))
+
+    async def iter_range(self, path: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Yield bytes ``start``..``end`` (inclusive) of a file via cached blocks."""
+        file_key = self._file_key(path)
+        block_size = self.block_size
+        for block in range(start // block_size, end // block_size + 1):
+            block_start = block * block_size
+            key = f"block:{file_key}:{block_size}:{block}"
+            if self._admit(key, block):
+                data = await self.get(
+                    key,
+                    lambda offset=block_start: asyncio.to_thread(
+                        _read_block, path, offset, block_size
+                    ),
+                )
+            else:
+                data = await asyncio.to_thread(
+                    _read_block, path, block_start, block_size
+                )
+            lo = max(start - block_start, 0)
+            hi = min(end - block_start + 1, len(data))
+            yield data[lo:hi]
+
+    def _admit(self, key: str, block: int) -> bool:
+        if block < settings.SEGMENT_CACHE_HEAD_BLOCKS:
+            return True
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return True
+        self._seen[key] = None
+        if len(self._seen) > ADMISSION_HISTORY:
+            self._seen.popitem(last=False)
+        return False
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Hit ratio and size statistics for each tier."""
+        return {
+            "memory": self.memory.stats.to_dict(),
+            "disk": self.disk.stats.to_dict(),
+        }
+
+
+def _read_block(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+# Global segment cache instance
+segment_cache = SegmentCache()
@@ -0,0 +1,92 @@
+"""Content-addressed storage for uploaded movie files."""
+
+import asyncio
+import glob
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds ``settings.MAX_FILE_SIZE``."""
+
+
+@dataclass
+class StoredFile:
+    """Result of storing an upload."""
+
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+def blob_dir(sha256: str) -> str:
+    """Directory holding the blob for a content hash."""
+    return os.path.join(settings.UPLOAD_DIR, "blobs", sha256[:2])
+
+
+def find_blob(sha256: str) -> str | None:
+    """Return the stored blob for a content hash, if any."""
+    matches = glob.glob(os.path.join(glob.escape(blob_dir(sha256)), f"{sha256}.*"))
+    return matches[0] if matches else None
+
+
+def media_dir(file_path: str) -> str:
+    """Directory for derived media (renditions, posters) stored next to a file."""
+    return os.path.splitext(file_path)[0]
+
+
+def _commit_blob(temp_path: str, sha256: str, extension: str) -> tuple[str, bool]:
+    existing = find_blob(sha256)
+    if existing:
+        os.remove(temp_path)
+        return existing, True
+
+    os.makedirs(blob_dir(sha256), exist_ok=True)
+    path = os.path.join(blob_dir(sha256), f"{sha256}.{extension}")
+    os.replace(temp_path, path)
+    return path, False
+
+
+def _write_chunk(buffer, digest, chunk: bytes) -> None:
+    # Hashing a 1MB chunk takes milliseconds, so it stays off the event loop
+    # along with the write (hashlib releases the GIL for large inputs).
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
+async def store_upload(file: UploadFile) -> StoredFile:
+    """Stream an upload to disk while hashing it, storing each content once."""
+    extension = os.path.splitext(file.filename or "")[1].lstrip(".").lower() or "bin"
+    temp_dir = os.path.join(settings.UPLOAD_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, f"{uuid.uuid4()}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.MAX_FILE_SIZE:
+                    raise FileTooLargeError(f"文件超过大小限制 {settings.MAX_FILE_SIZE} 字节")
+                await asyncio.to_thread(_write_chunk, buffer, digest, chunk)
+
+        sha256 = digest.hexdigest()
+        path, deduplicated = await asyncio.to_thread(
+            _commit_blob, temp_path, sha256, extension
+        )
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return StoredFile(path=path, sha256=sha256, size=size, deduplicated=deduplicated)
@@ -0,0 +1,117 @@
+"""Poster and thumbnail extraction from local movie files."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+
+from app.services.ffmpeg import run_ffmpeg
+from app.services.image_service import POSTER_SIZES, image_service
+from app.services.probe_service import probe_duration
+from app.services.storage_service import media_dir
+
+POSTER_NAME = "poster.jpg"
+
+# Candidate frames are taken at these fractions of the running time.
+CANDIDATE_POSITIONS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6)
+
+# Frames darker or flatter than this are treated as black/fade frames.
+MIN_MEAN_LUMA = 24.0
+MIN_LUMA_STDDEV = 12.0
+
+
+def thumbnail_name(size: str) -> str:
+    """File name of the extracted thumbnail for a poster size."""
+    return f"thumb_{size}.jpg"
+
+
+def poster_path(file_path: str) -> str:
+    """Path of the extracted poster for a stored file."""
+    return os.path.join(media_dir(file_path), POSTER_NAME)
+
+
+def _luma_stats(path: str) -> tuple[float, float]:
+    from PIL import Image, ImageStat
+
+    with Image.open(path) as image:
+        stat = ImageStat.Stat(image.convert("L"))
+        return stat.mean[0], stat.stddev[0]
+
+
+def _write_variants(source: str, target_dir: str) -> None:
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        poster = image.copy()
+        poster.thumbnail((POSTER_SIZES["detail"], POSTER_SIZES["detail"]))
+        poster.save(os.path.join(target_dir, POSTER_NAME), quality=85)
+        for size in ("thumbnail", "card"):
+            thumb = image.copy()
+            thumb.thumbnail((POSTER_SIZES[size], POSTER_SIZES[size]))
+            thumb.save(os.path.join(target_dir, thumbnail_name(size)), quality=80)
+
+
+async def _extract_frame(file_path: str, seconds: float, output: str) -> str | None:
+    # Input-side -ss seeks by keyframe, so each frame costs one short decode.
+    await run_ffmpeg(
+        "-ss",
+        f"{seconds:.2f}",
+        "-i",
+        file_path,
+        "-frames:v",
+        "1",
+        "-q:v",
+        "2",
+        output,
+    )
+    return output if os.path.exists(output) else None
+
+
+async def extract_poster(file_path: str, duration: float | None = None) -> str:
+    """Pick a representative non-black frame and write poster + thumbnails."""
+    target_dir = media_dir(file_path)
+    if os.path.exists(poster_path(file_path)):
+        return poster_path(file_path)
+
+    if duration is None:
+        duration = await probe_duration(file_path)
+    positions = [duration * p for p in CANDIDATE_POSITIONS] if duration else [1.0]
+
+    os.makedirs(target_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix="frames-", dir=target_dir)
+    try:
+        frames = await asyncio.gather(
+            *(
+                _extract_frame(file_path, t, os.path.join(scratch, f"{i}.jpg"))
+                for i, t in enumerate(positions)
+            )
+        )
+        frames = [frame for frame in frames if frame]
+        if not frames:
+            raise FileNotFoundError(f"无法从 {file_path} 提取画面")
+
+        loop = asyncio.get_running_loop()
+        stats = await asyncio.gather(
+            *(
+                loop.run_in_executor(image_service.pool, _luma_stats, frame)
+                for frame in frames
+            )
+        )
+        scored = list(zip(frames, stats))
+        usable = [
+            frame
+            for frame, (mean, stddev) in scored
+            if mean >= MIN_MEAN_LUMA and stddev >= MIN_LUMA_STDDEV
+        ]
+        # Fall back to the most detailed frame when everything is dark.
+        best = usable[0] if usable else max(scored, key=lambda item: item[1][1])[0]
+
+        await loop.run_in_executor(image_service.pool, _write_variants, best, scratch)
+        # The poster is moved last: its presence marks the extraction complete.
+        for name in (thumbnail_name("thumbnail"), thumbnail_name("card"), POSTER_NAME):
+            os.replace(os.path.join(scratch, name), os.path.join(target_dir, name))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return poster_path(file_path)
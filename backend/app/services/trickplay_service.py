@@ -0,0 +1,116 @@
+"""Trick-play sprite sheets and WebVTT thumbnail tracks for seek previews."""
+
+import asyncio
+import math
+import os
+import shutil
+import tempfile
+
+from app.core.config import settings
+from app.services.ffmpeg import run_ffmpeg
+from app.services.probe_service import probe_duration
+from app.services.storage_service import media_dir
+
+TRICKPLAY_VTT = "trickplay.vtt"
+SPRITE_PATTERN = "trickplay_{index:03d}.jpg"
+
+
+def trickplay_vtt_path(file_path: str) -> str:
+    """Path of the WebVTT thumbnail track for a stored file."""
+    return os.path.join(media_dir(file_path), TRICKPLAY_VTT)
+
+
+def _timestamp(seconds: float) -> str:
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def build_vtt(
+    duration: float,
+    interval: int,
+    columns: int,
+    rows: int,
+    tile_width: int,
+    tile_height: int,
+) -> str:
+    """WebVTT cues mapping each interval to its tile in a sprite sheet."""
+    per_sheet = columns * rows
+    lines = ["WEBVTT", ""]
+    for index in range(math.ceil(duration / interval)):
+        start = index * interval
+        end = min(start + interval, duration)
+        sheet, position = divmod(index, per_sheet)
+        x = (position % columns) * tile_width
+        y = (position // columns) * tile_height
+        lines += [
+            f"{_timestamp(start)} --> {_timestamp(end)}",
+            f"{SPRITE_PATTERN.format(index=sheet)}"
+            f"#xywh={x},{y},{tile_width},{tile_height}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _sheet_size(path: str) -> tuple[int, int]:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return image.size
+
+
+async def generate_trickplay(file_path: str, duration: float | None = None) -> str:
+    """Render sprite sheets (one tile every N seconds) and their WebVTT index."""
+    if os.path.exists(trickplay_vtt_path(file_path)):
+        return trickplay_vtt_path(file_path)
+
+    if duration is None:
+        duration = await probe_duration(file_path)
+    if not duration:
+        raise ValueError(f"无法确定 {file_path} 的时长")
+
+    interval = settings.TRICKPLAY_INTERVAL_SECONDS
+    columns = settings.TRICKPLAY_COLUMNS
+    rows = settings.TRICKPLAY_ROWS
+    target_dir = media_dir(file_path)
+    os.makedirs(target_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix="trickplay-", dir=target_dir)
+    try:
+        await run_ffmpeg(
+            "-i",
+            file_path,
+            "-vf",
+            f"fps=1/{interval},scale={settings.TRICKPLAY_TILE_WIDTH}:-2,"
+            f"tile={columns}x{rows}",
+            "-q:v",
+            "5",
+            "-start_number",
+            "0",
+            os.path.join(scratch, SPRITE_PATTERN.replace("{index:03d}", "%03d")),
+        )
+        sprites = sorted(os.listdir(scratch))
+        if not sprites:
+            raise FileNotFoundError(f"无法从 {file_path} 生成缩略图")
+
+        # The tile filter pads every sheet to the full grid, so any sheet works.
+        sheet_width, sheet_height = await asyncio.to_thread(
+            _sheet_size, os.path.join(scratch, sprites[0])
+        )
+        vtt = build_vtt(
+            duration,
+            interval,
+            columns,
+            rows,
+            sheet_width // columns,
+            sheet_height // rows,
+        )
+        with open(os.path.join(scratch, TRICKPLAY_VTT), "w", encoding="utf-8") as f:
+            f.write(vtt)
+
+        # The VTT index is moved last: its presence marks the track complete.
+        for name in [*sprites, TRICKPLAY_VTT]:
+            os.replace(os.path.join(scratch, name), os.path.join(target_dir, name))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return trickplay_vtt_path(file_path)
@@ -0,0 +1,180 @@
+"""Deterministic synthetic catalogue for benchmarks.
+
+Every value is drawn from seeded generators in a fixed order, so the same
+``DatasetSpec`` always produces byte-identical rows regardless of batch size
+or database.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.database import Base
+from app.models.favorite import Favorite
+from app.models.movie import Movie
+from app.models.user import User
+
+GENRES = "动作 科幻 剧情 喜剧 爱情 悬疑 动画 犯罪 奇幻 纪录片 战争 家庭".split()
+CJK_WORDS = (
+    "星际 长安 江湖 少年 风暴 迷城 归途 夜行 白夜 追光 山海 破晓 无间 流浪 地球 "
+    "唐人街 探案 烈火 英雄 孤岛 青春 时光 秘密 银河 密码 深海 风云 乘风 天涯 明月"
+).split()
+LATIN_WORDS = (
+    "Shadow Empire Last Night River Storm Echo Silent Iron Garden Midnight Horizon "
+    "Ghost Crimson Frontier Signal Harbor Winter Origin Paradise Machine Voyage "
+    "Legacy Dust"
+).split()
+DESCRIPTION_TEMPLATES = [
+    "{a}与{b}之间的故事，一段关于{genre}的冒险在{year}年拉开序幕。",
+    "When {a} meets {b}, nothing in {year} will ever be the same. A {genre} story.",
+    "改编自真实事件，讲述{a}在{b}中寻找答案的旅程。",
+    "A sweeping {genre} epic following {a} across the {b}.",
+]
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and shape of a synthetic catalogue."""
+
+    movies: int = 10_000
+    users: int = 1_000
+    # Mean favorites per user; counts are geometric and targets Zipf-like,
+    # so a few titles collect most favorites like a real catalogue.
+    favorites_per_user: float = 20.0
+    cjk_ratio: float = 0.6
+    seed: int = 42
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _title(rng: random.Random, spec: DatasetSpec) -> str:
+    if rng.random() < spec.cjk_ratio:
+        title = "".join(rng.sample(CJK_WORDS, rng.randint(1, 3)))
+    else:
+        title = " ".join(rng.sample(LATIN_WORDS, rng.randint(1, 3)))
+        if rng.random() < 0.4:
+            title = f"The {title}"
+    if rng.random() < 0.15:
+        title = f"{title} {rng.randint(2, 5)}"
+    return title
+
+
+def generate_movies(spec: DatasetSpec) -> Iterator[dict[str, Any]]:
+    """Movie rows with realistic titles, genres and rating spread."""
+    rng = random.Random(f"movies:{spec.seed}")
+    for i in range(spec.movies):
+        genre = "/".join(rng.sample(GENRES, rng.choice((1, 1, 2, 2, 2, 3))))
+        year = min(2025, int(2025 - rng.expovariate(1 / 12)))
+        rating = round(min(9.8, max(2.0, rng.gauss(6.8, 1.2))), 1)
+        words = CJK_WORDS if rng.random() < spec.cjk_ratio else LATIN_WORDS
+        description = rng.choice(DESCRIPTION_TEMPLATES).format(
+            a=rng.choice(words), b=rng.choice(words), genre=genre, year=year
+        )
+        yield {
+            "title": _title(rng, spec),
+            "description": description * rng.randint(1, 4),
+            "poster_url": f"https://img.example.com/posters/{i}.jpg",
+            "rating": rating if rng.random() > 0.05 else None,
+            "year": max(1950, year),
+            "genre": genre,
+            "duration": rng.randint(80, 180),
+            "stream_url": f"https://stream.example.com/{i}.m3u8",
+            "external_id": f"bench-{i}",
+            "is_local": False,
+            "created_at": EPOCH + timedelta(seconds=i * 37),
+            "updated_at": EPOCH + timedelta(seconds=i * 37),
+        }
+
+
+def generate_users(spec: DatasetSpec) -> Iterator[dict[str, Any]]:
+    """Benchmark users; passwords are placeholders, not valid hashes."""
+    for i in range(spec.users):
+        yield {
+            "username": f"bench_user_{i}",
+            "email": f"bench_user_{i}@example.com",
+            "hashed_password": "!",
+            "is_active": True,
+            "is_superuser": False,
+        }
+
+
+def generate_favorites(spec: DatasetSpec) -> Iterator[dict[str, Any]]:
+    """(user, movie) pairs; ids assume users and movies were loaded first."""
+    rng = random.Random(f"favorites:{spec.seed}")
+    p = 1 / (spec.favorites_per_user + 1)
+    for user_id in range(1, spec.users + 1):
+        count = min(spec.movies // 2, int(rng.expovariate(p)))
+        movie_ids: set[int] = set()
+        while len(movie_ids) < count:
+            # Mostly Pareto-distributed ranks (low ids are the blockbusters),
+            # with a uniform long tail.
+            if rng.random() < 0.8:
+                movie_ids.add(min(spec.movies, int(rng.paretovariate(1.2))))
+            else:
+                movie_ids.add(rng.randint(1, spec.movies))
+        for n, movie_id in enumerate(sorted(movie_ids)):
+            stamp = EPOCH + timedelta(days=400, seconds=user_id * 1000 + n)
+            yield {
+                "user_id": user_id,
+                "movie_id": movie_id,
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+
+
+def _batches(
+    rows: Iterator[dict[str, Any]], size: int
+) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def populate(
+    engine: AsyncEngine, spec: DatasetSpec, batch_size: int = 5000
+) -> bool:
+    """Create the schema and load ``spec`` unless it is already loaded.
+
+    Returns True if data was written. The database must be empty or hold a
+    dataset of the same size; anything else is rejected rather than mixed.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = await conn.scalar(select(func.count()).select_from(Movie))
+    if existing == spec.movies:
+        return False
+    if existing:
+        raise RuntimeError(f"数据库已有 {existing} 部电影，与数据集规模 {spec.movies} 不一致，请使用空库")
+
+    for model, rows in (
+        (User, generate_users(spec)),
+        (Movie, generate_movies(spec)),
+        (Favorite, generate_favorites(spec)),
+    ):
+        for batch in _batches(rows, batch_size):
+            async with engine.begin() as conn:
+                await conn.execute(insert(model.__table__), batch)
+
+    # Denormalized counters, as Favorite.create would have maintained them.
+    favorites = Favorite.__table__
+    movies = Movie.__table__
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(movies).values(
+                favorite_count=select(func.count())
+                .where(favorites.c.movie_id == movies.c.id)
+                .scalar_subquery()
+            )
+        )
+    return True
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+聚合搜索压测
+
+    python -m benchmarks.loadtest --concurrency 50 --duration 30
+    python -m benchmarks.loadtest --youtube-hang-rate 0.05 --douban-latency-ms 300
+    python -m benchmarks.loadtest --target http://127.0.0.1:8000 --concurrency 100
+
+By default the API runs in-process with its Douban/YouTube base URLs pointed
+at ``benchmarks.upstream_stubs`` started on an ephemeral port, and the local
+search part reads a synthetic catalogue (see ``benchmarks.dataset``). With
+``--target`` the driver sends traffic to a running server instead; start the
+stubs separately and configure that server's ``DOUBAN_BASE_URL`` and
+``YOUTUBE_BASE_URL``.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient, HTTPError, Timeout
+
+from app.core.config import settings
+from benchmarks.dataset import CJK_WORDS, LATIN_WORDS
+from benchmarks.run import percentile
+from benchmarks.upstream_stubs import add_profile_arguments, stubs_from_args
+
+FEDERATED_SEARCH_PATH = "/api/v1/movies/search/federated"
+
+
+async def drive(
+    client: AsyncClient,
+    queries: list[str],
+    concurrency: int,
+    duration: float,
+    max_requests: int | None = None,
+) -> dict[str, Any]:
+    """Closed-loop load: ``concurrency`` workers issue requests back to back."""
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (
+            max_requests is None or issued < max_requests
+        ):
+            query = queries[issued % len(queries)]
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(FEDERATED_SEARCH_PATH, params={"q": query})
+                statuses[str(response.status_code)] += 1
+            except HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 2),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "statuses": dict(statuses),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+async def run_in_process(
+    args: argparse.Namespace, queries: list[str]
+) -> dict[str, Any]:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.core.database import _async_url, _create_engine, get_read_db
+    from app.main import app
+    from benchmarks.dataset import DatasetSpec, populate
+
+    engine = _create_engine(_async_url(args.database_url))
+    engine.echo = False
+    await populate(engine, DatasetSpec(movies=args.movies, users=1))
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_db():
+        async with maker() as session:
+            yield session
+
+    stubs = stubs_from_args(args)
+    base_url = await stubs.start()
+    previous = (settings.DOUBAN_BASE_URL, settings.YOUTUBE_BASE_URL)
+    settings.DOUBAN_BASE_URL = settings.YOUTUBE_BASE_URL = base_url
+    app.dependency_overrides[get_read_db] = override_db
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=Timeout(args.request_timeout),
+        ) as client:
+            report = await drive(
+                client, queries, args.concurrency, args.duration, args.requests
+            )
+    finally:
+        app.dependency_overrides.clear()
+        settings.DOUBAN_BASE_URL, settings.YOUTUBE_BASE_URL = previous
+        await stubs.stop()
+        await engine.dispose()
+
+    report["upstreams"] = {
+        f"{source}.{outcome}": count
+        for (source, outcome), count in sorted(stubs.stats.items())
+    }
+    return report
+
+
+async def run_against_target(
+    args: argparse.Namespace, queries: list[str]
+) -> dict[str, Any]:
+    async with AsyncClient(
+        base_url=args.target, timeout=Timeout(args.request_timeout)
+    ) as client:
+        return await drive(
+            client, queries, args.concurrency, args.duration, args.requests
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="聚合搜索压测")
+    parser.add_argument("--target", help="已运行的 API 地址；不指定则在进程内启动")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=20.0, help="压测时长（秒）")
+    parser.add_argument("--requests", type=int, help="最多发送的请求数")
+    parser.add_argument("--request-timeout", type=float, default=30.0, help="客户端超时（秒）")
+    parser.add_argument(
+        "--database-url",
+        default="sqlite+aiosqlite:///benchmarks/loadtest.db",
+        help="进程内模式下本地搜索使用的数据库",
+    )
+    parser.add_argument("--movies", type=int, default=10_000, help="本地目录电影数量")
+    parser.add_argument("--output", help="将结果写入 JSON 文件")
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    # Queries rotate deterministically so runs see the same mix.
+    queries = [*CJK_WORDS, *LATIN_WORDS]
+    if args.target:
+        report = asyncio.run(run_against_target(args, queries))
+    else:
+        report = asyncio.run(run_in_process(args, queries))
+
+    report["config"] = {
+        key: value for key, value in vars(args).items() if key != "output"
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
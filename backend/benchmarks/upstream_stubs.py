@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+豆瓣 / YouTube 上游模拟服务
+
+    python -m benchmarks.upstream_stubs serve --port 8081 --douban-latency-ms 120
+    DOUBAN_BASE_URL=http://127.0.0.1:8081 YOUTUBE_BASE_URL=http://127.0.0.1:8081 python run.py
+
+    python -m benchmarks.upstream_stubs record 流浪地球
+
+Replays recorded Douban suggest JSON and YouTube results HTML from
+``benchmarks/fixtures`` with a configurable latency and failure profile per
+source, so federated search can be load-tested without the internet.
+Latency is log-normal around the configured median; failures are either
+HTTP 503s or hangs that outlast the client's timeout.
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+from collections import Counter
+from dataclasses import dataclass
+
+from aiohttp import ClientSession, web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SOURCES = {
+    "douban": ("/j/subject_suggest", "douban_subject_suggest.json", "application/json"),
+    "youtube": ("/results", "youtube_results.html", "text/html; charset=utf-8"),
+}
+REAL_URLS = {
+    "douban": ("https://movie.douban.com/j/subject_suggest", "q"),
+    "youtube": ("https://www.youtube.com/results", "search_query"),
+}
+
+
+@dataclass
+class UpstreamProfile:
+    """Latency and failure behaviour of one stubbed upstream."""
+
+    latency_ms: float = 80.0  # median
+    sigma: float = 0.5  # log-normal spread; 0 gives a constant latency
+    error_rate: float = 0.0  # fraction answered with HTTP 503
+    hang_rate: float = 0.0  # fraction that stall for ``hang_seconds``
+    hang_seconds: float = 30.0
+
+    def delay(self, rng: random.Random) -> float:
+        """Seconds to wait before answering."""
+        return rng.lognormvariate(math.log(self.latency_ms / 1000), self.sigma)
+
+
+class UpstreamStubs:
+    """aiohttp server answering both upstreams from fixture files."""
+
+    def __init__(
+        self,
+        profiles: dict[str, UpstreamProfile] | None = None,
+        fixtures_dir: str = FIXTURES_DIR,
+        youtube_page_kb: int = 400,
+        seed: int = 0,
+    ) -> None:
+        self.profiles = {source: UpstreamProfile() for source in SOURCES}
+        self.profiles.update(profiles or {})
+        self.rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self._bodies = {
+            source: self._load(fixtures_dir, filename, source, youtube_page_kb)
+            for source, (_, filename, _) in SOURCES.items()
+        }
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+    @staticmethod
+    def _load(fixtures_dir: str, filename: str, source: str, page_kb: int) -> bytes:
+        with open(os.path.join(fixtures_dir, filename), "rb") as file:
+            body = file.read()
+        if source == "youtube" and len(body) < page_kb * 1024:
+            # Real results pages are mostly inline scripts; pad the fixture so
+            # the HTML parser does a realistic amount of work.
+            filler = b"<script>var ytInitialData = {};</script>\n"
+            padding = filler * ((page_kb * 1024 - len(body)) // len(filler))
+            body = body.replace(b"<!--PADDING-->", padding)
+        return body
+
+    def _handler(self, source: str):
+        profile = self.profiles[source]
+        content_type = SOURCES[source][2]
+
+        async def handle(request: web.Request) -> web.Response:
+            roll = self.rng.random()
+            if roll < profile.hang_rate:
+                self.stats[source, "hang"] += 1
+                await asyncio.sleep(profile.hang_seconds)
+                return web.Response(status=504, text="upstream timed out")
+            await asyncio.sleep(profile.delay(self.rng))
+            if roll >= 1 - profile.error_rate:
+                self.stats[source, "error"] += 1
+                return web.Response(status=503, text="upstream unavailable")
+            self.stats[source, "ok"] += 1
+            return web.Response(
+                body=self._bodies[source], headers={"Content-Type": content_type}
+            )
+
+        return handle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; returns the base URL for both upstreams."""
+        app = web.Application()
+        for source, (path, _, _) in SOURCES.items():
+            app.router.add_get(path, self._handler(source))
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Per-source latency/failure flags, shared with the load-test driver."""
+    parser.add_argument("--sigma", type=float, default=0.5, help="延迟对数正态分布的离散度")
+    parser.add_argument("--stub-seed", type=int, default=0, help="延迟与故障注入的随机种子")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="录制的上游响应目录")
+    parser.add_argument(
+        "--youtube-page-kb", type=int, default=400, help="YouTube 结果页大小（KB）"
+    )
+    for source in SOURCES:
+        parser.add_argument(
+            f"--{source}-latency-ms", type=float, default=80.0, help=f"{source} 延迟中位数"
+        )
+        parser.add_argument(
+            f"--{source}-error-rate",
+            type=float,
+            default=0.0,
+            help=f"{source} 返回 503 的比例",
+        )
+        parser.add_argument(
+            f"--{source}-hang-rate", type=float, default=0.0, help=f"{source} 挂起不响应的比例"
+        )
+
+
+def stubs_from_args(args: argparse.Namespace) -> UpstreamStubs:
+    """Build stubs from ``add_profile_arguments`` flags."""
+    profiles = {
+        source: UpstreamProfile(
+            latency_ms=getattr(args, f"{source}_latency_ms"),
+            sigma=args.sigma,
+            error_rate=getattr(args, f"{source}_error_rate"),
+            hang_rate=getattr(args, f"{source}_hang_rate"),
+        )
+        for source in SOURCES
+    }
+    return UpstreamStubs(profiles, args.fixtures, args.youtube_page_kb, args.stub_seed)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    stubs = stubs_from_args(args)
+    base_url = await stubs.start(args.host, args.port)
+    print(f"上游模拟服务已启动: {base_url}")
+    print(f"  DOUBAN_BASE_URL={base_url} YOUTUBE_BASE_URL={base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stubs.stop()
+        print(dict(stubs.stats))
+
+
+async def record(args: argparse.Namespace) -> None:
+    """Capture live upstream responses as fixtures."""
+    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+    os.makedirs(args.out, exist_ok=True)
+    async with ClientSession(headers=headers) as session:
+        for source, (url, param) in REAL_URLS.items():
+            query = args.query if source == "douban" else f"{args.query} trailer"
+            async with session.get(url, params={param: query}) as response:
+                response.raise_for_status()
+                body = await response.read()
+            path = os.path.join(args.out, SOURCES[source][1])
+            with open(path, "wb") as file:
+                file.write(body)
+            print(f"{source}: {len(body)} 字节 -> {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="豆瓣 / YouTube 上游模拟服务")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="启动模拟服务")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8081)
+    add_profile_arguments(serve_parser)
+    record_parser = commands.add_parser("record", help="录制真实上游响应为 fixture")
+    record_parser.add_argument("query", help="搜索关键词")
+    record_parser.add_argument("--out", default=FIXTURES_DIR, help="输出目录")
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args) if args.command == "serve" else record(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+流式导出电影目录（CSV / NDJSON）
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.services.catalog_export import EXPORT_FORMATS, stream_catalog
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.core.database import close_db
+
+    compress = args.gzip or args.output.endswith(".gz")
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        async for chunk in stream_catalog(args.format, compress, args.batch_size):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="流式导出电影目录")
+    parser.add_argument("output", help="输出文件路径，- 表示标准输出")
+    parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="ndjson", help="文件格式"
+    )
+    parser.add_argument("--gzip", action="store_true", help="gzip压缩（.gz 结尾时自动启用）")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.CATALOG_EXPORT_BATCH_SIZE,
+        help="每次从游标读取的行数",
+    )
+    asyncio.run(main(parser.parse_args()))
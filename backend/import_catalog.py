@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+批量导入电影目录（CSV / NDJSON）
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.services.catalog_import import CATALOG_FORMATS, ImportResult, import_catalog
+
+
+async def report(fraction: float, result: ImportResult) -> None:
+    print(
+        f"\r{fraction:6.1%}  已导入 {result.imported}  跳过 {result.skipped}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.core.database import close_db
+    from app.core.redis import redis_client
+
+    # 连接 Redis 以便导入后使电影列表的 ETag 失效
+    await redis_client.connect()
+    try:
+        result = await import_catalog(
+            args.path, args.format, args.batch_size, progress=report
+        )
+    finally:
+        await redis_client.disconnect()
+        await close_db()
+
+    print(file=sys.stderr)
+    print(f"共读取 {result.rows} 行，导入 {result.imported} 条，跳过 {result.skipped} 条")
+    for error in result.errors:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="批量导入电影目录")
+    parser.add_argument("path", help="CSV 或 NDJSON 文件路径")
+    parser.add_argument("--format", choices=CATALOG_FORMATS, help="文件格式，默认按扩展名判断")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.CATALOG_IMPORT_BATCH_SIZE,
+        help="每批写入的行数",
+    )
+    asyncio.run(main(parser.parse_args()))
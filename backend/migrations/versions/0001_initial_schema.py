@@ -0,0 +1,105 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="创建时间",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="更新时间",
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(length=50), nullable=False, comment="用户名"),
+        sa.Column("email", sa.String(length=100), nullable=False, comment="邮箱"),
+        sa.Column(
+            "hashed_password", sa.String(length=255), nullable=False, comment="密码哈希"
+        ),
+        sa.Column("is_active", sa.Boolean(), nullable=False, comment="是否激活"),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False, comment="是否超级用户"),
+        *_timestamps(),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "movies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(length=200), nullable=False, comment="电影标题"),
+        sa.Column("description", sa.Text(), nullable=True, comment="电影描述"),
+        sa.Column("poster_url", sa.String(length=500), nullable=True, comment="海报URL"),
+        sa.Column("rating", sa.Float(), nullable=True, comment="评分"),
+        sa.Column("year", sa.Integer(), nullable=True, comment="年份"),
+        sa.Column("genre", sa.String(length=100), nullable=True, comment="类型"),
+        sa.Column("duration", sa.Integer(), nullable=True, comment="时长(分钟)"),
+        sa.Column("file_path", sa.String(length=500), nullable=True, comment="文件路径"),
+        sa.Column("stream_url", sa.String(length=500), nullable=True, comment="流媒体URL"),
+        sa.Column("is_local", sa.Boolean(), nullable=False, comment="是否本地文件"),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id"),
+            nullable=True,
+            comment="上传用户ID",
+        ),
+        *_timestamps(),
+    )
+    op.create_index("ix_movies_id", "movies", ["id"])
+    op.create_index("ix_movies_title", "movies", ["title"])
+
+    op.create_table(
+        "favorites",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id"),
+            nullable=False,
+            comment="用户ID",
+        ),
+        sa.Column(
+            "movie_id",
+            sa.Integer(),
+            sa.ForeignKey("movies.id"),
+            nullable=False,
+            comment="电影ID",
+        ),
+        *_timestamps(),
+    )
+    op.create_index("ix_favorites_id", "favorites", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("favorites")
+    op.drop_table("movies")
+    op.drop_table("users")
@@ -0,0 +1,50 @@
+"""favorite counters and favorites pagination index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "movies",
+        sa.Column(
+            "favorite_count",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+            comment="收藏数",
+        ),
+    )
+    op.create_index("ix_movies_favorite_count", "movies", ["favorite_count"])
+    op.create_index(
+        "ix_favorites_user_id_created_at", "favorites", ["user_id", "created_at"]
+    )
+
+    # Backfill the counter once; afterwards it is maintained incrementally.
+    op.execute(
+        """
+        UPDATE movies SET favorite_count = counts.n
+        FROM (
+            SELECT movie_id, COUNT(*) AS n FROM favorites GROUP BY movie_id
+        ) AS counts
+        WHERE movies.id = counts.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_favorites_user_id_created_at", table_name="favorites")
+    op.drop_index("ix_movies_favorite_count", table_name="movies")
+    op.drop_column("movies", "favorite_count")
@@ -0,0 +1,31 @@
+"""movie content hash for deduplicated uploads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "movies",
+        sa.Column(
+            "content_hash", sa.String(length=64), nullable=True, comment="文件内容SHA-256"
+        ),
+    )
+    op.create_index("ix_movies_content_hash", "movies", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_content_hash", table_name="movies")
+    op.drop_column("movies", "content_hash")
@@ -0,0 +1,61 @@
+"""media info table for probed codecs, resolution and keyframes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_info",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "movie_id",
+            sa.Integer(),
+            sa.ForeignKey("movies.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+            comment="电影ID",
+        ),
+        sa.Column("container", sa.String(length=100), nullable=True, comment="容器格式"),
+        sa.Column("video_codec", sa.String(length=50), nullable=True, comment="视频编码"),
+        sa.Column("audio_codec", sa.String(length=50), nullable=True, comment="音频编码"),
+        sa.Column("width", sa.Integer(), nullable=True, comment="宽度"),
+        sa.Column("height", sa.Integer(), nullable=True, comment="高度"),
+        sa.Column("frame_rate", sa.Float(), nullable=True, comment="帧率"),
+        sa.Column("bitrate", sa.BigInteger(), nullable=True, comment="码率(bps)"),
+        sa.Column("duration_seconds", sa.Float(), nullable=True, comment="时长(秒)"),
+        sa.Column(
+            "keyframes", sa.JSON(), nullable=True, comment="关键帧索引 [[时间, 字节偏移], ...]"
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="创建时间",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="更新时间",
+        ),
+    )
+    op.create_index("ix_media_info_id", "media_info", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("media_info")
@@ -0,0 +1,31 @@
+"""movie external id as the natural key for catalogue imports
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "movies",
+        sa.Column(
+            "external_id", sa.String(length=100), nullable=True, comment="外部目录ID"
+        ),
+    )
+    op.create_index("ix_movies_external_id", "movies", ["external_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_external_id", table_name="movies")
+    op.drop_column("movies", "external_id")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+后台任务 worker 启动脚本
+"""
+import argparse
+import asyncio
+import multiprocessing
+
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+
+
+async def serve(concurrency: int) -> None:
+    from app.core.redis import redis_client
+    from app.services import catalog_import, media_tasks  # noqa: F401  注册任务处理函数
+    from app.services.job_queue import JobWorker, job_queue
+
+    await redis_client.connect()
+    try:
+        await JobWorker(job_queue, concurrency).run()
+    finally:
+        await redis_client.disconnect()
+
+
+def run(concurrency: int) -> None:
+    setup_logging()
+    asyncio.run(serve(concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="运行后台任务 worker")
+    parser.add_argument("--processes", type=int, default=1, help="worker 进程数")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.JOB_WORKER_CONCURRENCY,
+        help="每个进程并发执行的任务数",
+    )
+    args = parser.parse_args()
+
+    processes = [
+        multiprocessing.Process(target=run, args=(args.concurrency,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
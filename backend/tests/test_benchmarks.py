@@ -0,0 +1,75 @@
+"""Benchmark suite smoke tests."""
+
+import pytest
+
+from benchmarks import run as bench
+from benchmarks.dataset import DatasetSpec, generate_favorites, generate_movies
+
+
+def test_dataset_is_deterministic() -> None:
+    """Test the same spec always yields the same rows."""
+    spec = DatasetSpec(movies=500, users=50, seed=7)
+    assert list(generate_movies(spec)) == list(generate_movies(spec))
+    assert list(generate_favorites(spec)) == list(generate_favorites(spec))
+
+    other = list(generate_movies(DatasetSpec(movies=500, users=50, seed=8)))
+    assert other != list(generate_movies(spec))
+
+    pairs = [(f["user_id"], f["movie_id"]) for f in generate_favorites(spec)]
+    assert len(pairs) == len(set(pairs))
+    assert all(1 <= movie_id <= spec.movies for _, movie_id in pairs)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_run_reports_every_scenario(tmp_path) -> None:
+    """Test a tiny run drives every scenario and reports percentiles."""
+    args = bench.parse_args(
+        [
+            f"--database-url=sqlite+aiosqlite:///{tmp_path / 'bench.db'}",
+            "--movies=200",
+            "--users=20",
+            "--iterations=5",
+            "--warmup=1",
+            "--repeat=1",
+        ]
+    )
+    report = await bench.run(args)
+
+    assert set(report["results"]) == set(bench.SCENARIOS)
+    for result in report["results"].values():
+        assert 0 < result["p50_ms"] <= result["p99_ms"]
+    assert report["meta"]["dataset"]["movies"] == 200
+    assert bench.compare(report, report, threshold=0.1)
+
+
+@pytest.mark.asyncio
+async def test_search_service_uses_upstream_stubs(monkeypatch) -> None:
+    """Test federated search reads replayed fixtures and survives injected failures."""
+    from app.core.config import settings
+    from app.services.search_service import MovieSearchService
+    from benchmarks.upstream_stubs import UpstreamProfile, UpstreamStubs
+
+    stubs = UpstreamStubs(
+        {
+            "douban": UpstreamProfile(latency_ms=1, sigma=0),
+            "youtube": UpstreamProfile(latency_ms=1, sigma=0, hang_rate=1.0),
+        },
+        youtube_page_kb=16,
+    )
+    base_url = await stubs.start()
+    monkeypatch.setattr(settings, "DOUBAN_BASE_URL", base_url)
+    monkeypatch.setattr(settings, "YOUTUBE_BASE_URL", base_url)
+    monkeypatch.setattr(settings, "SEARCH_UPSTREAM_TIMEOUT", 0.2)
+    service = MovieSearchService()
+    try:
+        douban = await service._search_douban("流浪地球", 1)
+        youtube = await service._search_youtube("Interstellar", 1)
+    finally:
+        await stubs.stop()
+
+    assert douban[0]["title"] == "流浪地球"
+    assert douban[0]["rating"] == 7.9
+    assert {movie["source"] for movie in douban} == {"douban"}
+    # The hung upstream is cut off by SEARCH_UPSTREAM_TIMEOUT.
+    assert youtube == []
+    assert stubs.stats == {("douban", "ok"): 1, ("youtube", "hang"): 1}
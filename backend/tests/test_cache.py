@@ -0,0 +1,110 @@
+"""Cache tests."""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import DiskLRUCache, MemoryLRUCache
+from app.core.config import settings
+from app.services.segment_cache import SegmentCache
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    """Test the memory tier stays within its byte budget."""
+    cache = MemoryLRUCache(capacity_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+
+    cache.set("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.stats.size_bytes == 8
+    assert cache.stats.evictions == 1
+
+
+def test_disk_cache_evicts_and_survives_restart(tmp_path) -> None:
+    """Test the disk tier evicts by recency and reloads its index."""
+    cache = DiskLRUCache(str(tmp_path), capacity_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.set("c", b"cccc")
+
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+
+    reopened = DiskLRUCache(str(tmp_path), capacity_bytes=10)
+    assert reopened.get("c") == b"cccc"
+    assert reopened.stats.size_bytes == 8
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_serves_ranges_from_blocks(tmp_path, monkeypatch) -> None:
+    """Test byte ranges are assembled from cached blocks."""
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_BLOCK_SIZE", 4)
+    movie = tmp_path / "movie.mp4"
+    movie.write_bytes(bytes(range(20)))
+    cache = SegmentCache()
+
+    first = b"".join([c async for c in cache.iter_range(str(movie), 3, 9)])
+    second = b"".join([c async for c in cache.iter_range(str(movie), 3, 9)])
+
+    assert first == second == bytes(range(3, 10))
+    # Bytes 3..9 span blocks 0, 1 and 2.
+    assert cache.memory.stats.misses == 3
+    assert cache.memory.stats.hits == 3
+
+
+@pytest.mark.asyncio
+async def test_segment_load_survives_cancelled_requester(tmp_path, monkeypatch) -> None:
+    """Test cancelling the first requester does not fail the other waiters."""
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_DIR", str(tmp_path / "cache"))
+    cache = SegmentCache()
+    release = asyncio.Event()
+    loads = 0
+
+    async def loader() -> bytes:
+        nonlocal loads
+        loads += 1
+        await release.wait()
+        return b"segment"
+
+    first = asyncio.create_task(cache.get("seg", loader))
+    second = asyncio.create_task(cache.get("seg", loader))
+    await asyncio.sleep(0.05)
+    first.cancel()
+    release.set()
+
+    assert await second == b"segment"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert loads == 1
+    assert cache.memory.get("seg") == b"segment"
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_admits_tail_blocks_on_second_hit(
+    tmp_path, monkeypatch
+) -> None:
+    """Test one sequential read caches only the head of the file."""
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_BLOCK_SIZE", 4)
+    monkeypatch.setattr(settings, "SEGMENT_CACHE_HEAD_BLOCKS", 1)
+    movie = tmp_path / "movie.mp4"
+    movie.write_bytes(bytes(range(20)))
+    cache = SegmentCache()
+
+    async def read() -> bytes:
+        return b"".join([c async for c in cache.iter_range(str(movie), 0, 19)])
+
+    assert await read() == bytes(range(20))
+    assert cache.memory.stats.size_bytes == 4  # only block 0
+
+    # Blocks requested again are admitted and served from cache afterwards.
+    assert await read() == bytes(range(20))
+    assert cache.memory.stats.size_bytes == 20
+    hits = cache.memory.stats.hits
+    assert await read() == bytes(range(20))
+    assert cache.memory.stats.hits == hits + 5
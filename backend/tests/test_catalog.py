@@ -0,0 +1,122 @@
+"""Catalogue import tests."""
+
+import gzip
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.movie import Movie
+from app.services import catalog_export, catalog_import
+
+
+@pytest.fixture
+async def sessionmaker(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Point the importer at a fresh SQLite database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(catalog_import, "AsyncSessionLocal", maker)
+    yield maker
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_import_csv_upserts_on_external_id(tmp_path, sessionmaker) -> None:
+    """Test a CSV feed is loaded in batches and re-imports update in place."""
+    feed = tmp_path / "titles.csv"
+    lines = ["external_id,title,year,rating,extra"]
+    lines += [f"tt{i},Movie {i},{2000 + i % 20},7.5,x" for i in range(25)]
+    lines += [
+        "tt3,Movie 3 (Remastered),2003,8.0,x",
+        ",Untracked,1999,,",
+        "tt99,,2001,,",
+    ]
+    feed.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    progress = []
+
+    async def report(fraction, result):
+        progress.append(fraction)
+
+    result = await catalog_import.import_catalog(
+        str(feed), batch_size=10, progress=report
+    )
+    # tt3 is written again by a later batch but counted once.
+    assert (result.rows, result.imported, result.skipped) == (28, 25, 2)
+    assert "external_id" in result.errors[0]
+    assert "title" in result.errors[1]
+    assert progress[-1] == 1.0
+
+    async with sessionmaker() as db:
+        assert await db.scalar(select(func.count(Movie.id))) == 25
+        remastered = await db.scalar(select(Movie).where(Movie.external_id == "tt3"))
+        assert remastered.title == "Movie 3 (Remastered)"
+        assert remastered.is_local is False
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_bad_lines(tmp_path, sessionmaker) -> None:
+    """Test malformed NDJSON lines are skipped without aborting the import."""
+    feed = tmp_path / "titles.ndjson"
+    records = [json.dumps({"external_id": "a", "title": "First"}), "{not json", "[]"]
+    records.append(json.dumps({"external_id": "a", "title": "First, again"}))
+    feed.write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    result = await catalog_import.import_catalog(str(feed))
+    assert (result.imported, result.skipped) == (1, 2)
+
+    async with sessionmaker() as db:
+        titles = (await db.scalars(select(Movie.title))).all()
+    assert titles == ["First, again"]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_gzip_ndjson(sessionmaker, monkeypatch) -> None:
+    """Test the export round-trips every movie through gzip NDJSON."""
+    monkeypatch.setattr(catalog_export, "AsyncReadSessionLocal", sessionmaker)
+    async with sessionmaker() as db:
+        await Movie.bulk_create(
+            db, [{"title": f"Movie {i}", "external_id": f"tt{i}"} for i in range(7)]
+        )
+
+    chunks = [chunk async for chunk in catalog_export.stream_catalog("ndjson", True, 3)]
+    records = [
+        json.loads(line) for line in gzip.decompress(b"".join(chunks)).splitlines()
+    ]
+    assert [r["external_id"] for r in records] == [f"tt{i}" for i in range(7)]
+    assert records[0]["favorite_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_import_job_removes_spooled_file_after_last_attempt(
+    tmp_path, monkeypatch
+) -> None:
+    """Test a failing import keeps its file for retries, then removes it."""
+    from app.core.config import settings
+    from app.services.job_queue import InMemoryJobBackend, JobQueue, JobStatus
+
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF", 0.0)
+    queue = JobQueue(InMemoryJobBackend())
+    queue.task(catalog_import.IMPORT_CATALOG)(catalog_import.run_catalog_import)
+    spooled = tmp_path / "feed.xml"
+    spooled.write_text("<movies/>")
+    seen: list[bool] = []
+
+    async def failing_import(path, fmt=None, progress=None):
+        seen.append(spooled.exists())
+        raise ValueError("bad feed")
+
+    monkeypatch.setattr(catalog_import, "import_catalog", failing_import)
+    job = await queue.enqueue(
+        catalog_import.IMPORT_CATALOG, {"path": str(spooled)}, max_retries=1
+    )
+    while await queue.run_next(timeout=0.1):
+        pass
+
+    assert seen == [True, True]
+    assert (await queue.get(job.id)).status == JobStatus.FAILED
+    assert not spooled.exists()
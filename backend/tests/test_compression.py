@@ -0,0 +1,82 @@
+"""Response compression tests."""
+
+import gzip
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import (
+    CompressionMiddleware,
+    PrecompressedCache,
+    choose_encoding,
+)
+
+PAYLOAD = json.dumps(
+    [{"title": f"电影 {i}", "description": "剧情" * 20} for i in range(50)]
+)
+
+
+async def json_app(scope, receive, send):
+    """Serve a large or small JSON body, optionally streamed in two chunks."""
+    body = PAYLOAD.encode() if scope["path"] != "/small" else b'{"ok": true}'
+    headers = [(b"content-type", b"application/json"), (b"etag", b'"v1"')]
+    if scope["path"] != "/stream":
+        headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    if scope["path"] == "/stream":
+        half = len(body) // 2
+        await send(
+            {"type": "http.response.body", "body": body[:half], "more_body": True}
+        )
+        await send({"type": "http.response.body", "body": body[half:]})
+    else:
+        await send({"type": "http.response.body", "body": body})
+
+
+def test_choose_encoding_honours_q_values() -> None:
+    """Test q=0 disables an encoding and unknown codings are ignored."""
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("zstd") is None
+    assert choose_encoding(None) is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_compresses_large_and_streamed_bodies() -> None:
+    """Test bodies over the threshold are gzipped and small ones pass through."""
+    transport = ASGITransport(app=CompressionMiddleware(json_app))
+    headers = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        large = await client.get("/large", headers=headers)
+        streamed = await client.get("/stream", headers=headers)
+        small = await client.get("/small", headers=headers)
+        identity = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    for response in (large, streamed):
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.text == PAYLOAD  # httpx decodes gzip transparently
+    assert int(large.headers["content-length"]) < len(PAYLOAD.encode()) / 4
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.text == PAYLOAD
+    assert "vary" not in small.headers
+
+
+def test_precompressed_cache_compresses_once_per_key() -> None:
+    """Test cache hits reuse the stored compressed bytes."""
+    cache = PrecompressedCache(capacity_bytes=1024 * 1024)
+    first = cache.response("favorites:1:v1", PAYLOAD, "gzip")
+    second = cache.response("favorites:1:v1", PAYLOAD, "gzip")
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.body == second.body
+    assert gzip.decompress(second.body).decode() == PAYLOAD
+    assert (cache.cache.stats.misses, cache.cache.stats.hits) == (1, 1)
+    identity = cache.response("k", PAYLOAD, None)
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
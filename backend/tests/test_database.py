@@ -0,0 +1,84 @@
+"""Database routing tests."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app.core import database
+from app.core.security import create_access_token
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Point the primary and replica at two SQLite files."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "async_engine", primary)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(
+        database, "AsyncSessionLocal", async_sessionmaker(primary, class_=AsyncSession)
+    )
+    monkeypatch.setattr(
+        database,
+        "AsyncReadSessionLocal",
+        async_sessionmaker(replica, class_=AsyncSession),
+    )
+    monkeypatch.setattr(database, "_recent_writers", {})
+    return primary, replica
+
+
+def _request(email: str) -> Request:
+    token = create_access_token(subject=email)
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+async def _read_bind(request: Request):
+    async for session in database.get_read_db(request):
+        return session.bind
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_own_write(engines) -> None:
+    """Test a user's reads are pinned to the primary right after they write."""
+    primary, replica = engines
+
+    assert await _read_bind(_request("reader@example.com")) is replica
+    # An expired marker of a user who never read again.
+    database._recent_writers["gone@example.com"] = 0.0
+
+    token = database.request_subject.set("writer@example.com")
+    try:
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+    finally:
+        database.request_subject.reset(token)
+
+    assert await _read_bind(_request("writer@example.com")) is primary
+    assert await _read_bind(_request("reader@example.com")) is replica
+    assert list(database._recent_writers) == ["writer@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_verify_schema_checks_alembic_revision(engines, monkeypatch) -> None:
+    """Test startup accepts only a database stamped at the migration head."""
+    primary, _ = engines
+    monkeypatch.setattr(database.redis_client, "_client", None)
+
+    with pytest.raises(database.SchemaOutOfDateError):
+        await database.verify_schema()
+
+    async with primary.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES ('0001')"))
+    with pytest.raises(database.SchemaOutOfDateError):
+        await database.verify_schema()
+
+    (head,) = database.migration_heads()
+    async with primary.begin() as conn:
+        await conn.execute(
+            text("UPDATE alembic_version SET version_num = :head"), {"head": head}
+        )
+    await database.verify_schema()
@@ -0,0 +1,133 @@
+"""Conditional GET tests."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_read_db
+from app.core.etag import MOVIES_VERSION_KEY, bump_version, etag_matches, make_etag
+from app.core.redis import redis_client
+from app.main import app
+from app.models.movie import Movie
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by version counters."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """API client on a fresh SQLite database with one movie."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'etag.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with maker() as db:
+        await Movie.create(db, title="流浪地球", year=2019)
+
+    async def override_db():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr(redis_client, "_client", FakeRedis())
+    app.dependency_overrides[get_read_db] = override_db
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        ac.sessionmaker = maker
+        yield ac
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def test_etag_matching() -> None:
+    """Test weak comparison, lists and the wildcard."""
+    etag = make_etag("movie", 1, "2024-01-01")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.asyncio
+async def test_detail_and_list_return_304_until_changed(client: AsyncClient) -> None:
+    """Test unchanged resources revalidate with 304 and changes produce new ETags."""
+    detail = await client.get("/api/v1/movies/1")
+    listing = await client.get("/api/v1/movies/")
+    assert detail.status_code == listing.status_code == 200
+
+    for response, url in ((detail, "/api/v1/movies/1"), (listing, "/api/v1/movies/")):
+        etag = response.headers["etag"]
+        again = await client.get(url, headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+    async with client.sessionmaker() as db:
+        await db.execute(update(Movie).where(Movie.id == 1).values(favorite_count=1))
+        await db.commit()
+    changed = await client.get(
+        "/api/v1/movies/1", headers={"If-None-Match": detail.headers["etag"]}
+    )
+    assert changed.status_code == 200
+    assert changed.json()["favorite_count"] == 1
+
+    # List ETags follow the version counter bumped by writers.
+    await bump_version(MOVIES_VERSION_KEY)
+    relisted = await client.get(
+        "/api/v1/movies/", headers={"If-None-Match": listing.headers["etag"]}
+    )
+    assert relisted.status_code == 200
+    assert relisted.headers["etag"] != listing.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets_narrow_payload_and_etag(client: AsyncClient) -> None:
+    """Test fields= trims list/detail payloads and gets its own ETag."""
+    card = "title,poster_url,rating"
+    listing = await client.get("/api/v1/movies/", params={"fields": card})
+    detail = await client.get("/api/v1/movies/1", params={"fields": card})
+    full = await client.get("/api/v1/movies/1")
+    assert listing.status_code == detail.status_code == 200
+
+    keys = {"id", "title", "poster_url", "rating"}
+    assert set(listing.json()["movies"][0]) == keys
+    assert listing.json()["total"] == 1
+    assert detail.json() == {
+        "id": 1,
+        "title": "流浪地球",
+        "poster_url": None,
+        "rating": None,
+    }
+    assert detail.headers["etag"] != full.headers["etag"]
+
+    again = await client.get(
+        "/api/v1/movies/1",
+        params={"fields": "rating, title,poster_url,title"},
+        headers={"If-None-Match": detail.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+    bad = await client.get("/api/v1/movies/", params={"fields": "title,password"})
+    assert bad.status_code == 400
+    assert "password" in bad.json()["detail"]
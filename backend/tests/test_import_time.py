@@ -0,0 +1,40 @@
+"""Startup import-time budget tests."""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative budget for ``import app.main``; override on slow CI machines.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500"))
+
+# Optional dependencies that must only load when their feature is used.
+LAZY_MODULES = ("aiohttp", "bs4", "passlib", "jose", "PIL")
+
+
+def _import_profile() -> dict[str, int]:
+    """Cumulative import time in microseconds per module, via -X importtime."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_app_import_time_budget() -> None:
+    """Test importing the app stays within budget and skips optional modules."""
+    profile = _import_profile()
+
+    eager = [name for name in LAZY_MODULES if name in profile]
+    assert not eager, f"imported at startup: {eager}"
+    assert profile["app.main"] / 1000 < IMPORT_TIME_BUDGET_MS
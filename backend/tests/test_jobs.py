@@ -0,0 +1,208 @@
+"""Background job queue tests."""
+
+import pytest
+
+from app.core.redis import redis_client
+from app.services.job_queue import (
+    InMemoryJobBackend,
+    JobQueue,
+    JobQueueUnavailableError,
+    JobStatus,
+    RedisJobBackend,
+)
+
+
+class FakeRedis:
+    """The strings and sorted sets used by RedisJobBackend."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def zadd(self, key, mapping, xx=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not xx or member in zset:
+                zset[member] = score
+
+    async def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    async def zrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        return [
+            m for m, score in sorted(zset.items(), key=lambda i: i[1]) if score <= high
+        ]
+
+    async def eval(self, script, numkeys, ready, processing, deadline):
+        # RedisJobBackend.POP_SCRIPT: ZPOPMIN ready, then ZADD it to processing.
+        zset = self.zsets.get(ready, {})
+        if not zset:
+            return None
+        job_id = min(zset, key=zset.get)
+        del zset[job_id]
+        self.zsets.setdefault(processing, {})[job_id] = deadline
+        return job_id
+
+
+@pytest.fixture
+def queue(monkeypatch: pytest.MonkeyPatch) -> JobQueue:
+    """Job queue backed by process memory."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF", 0.0)
+    return JobQueue(InMemoryJobBackend())
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_by_priority(queue: JobQueue) -> None:
+    """Test higher priority jobs run first, FIFO within a priority."""
+    seen: list[str] = []
+
+    @queue.task("record")
+    async def record(ctx, payload):
+        seen.append(payload["name"])
+
+    await queue.enqueue("record", {"name": "low"}, priority=0)
+    await queue.enqueue("record", {"name": "high"}, priority=10)
+    await queue.enqueue("record", {"name": "low-2"}, priority=0)
+
+    while await queue.run_next(timeout=0):
+        pass
+
+    assert seen == ["high", "low", "low-2"]
+
+
+@pytest.mark.asyncio
+async def test_job_progress_and_result(queue: JobQueue) -> None:
+    """Test progress reports and results are stored on the job."""
+
+    @queue.task("work")
+    async def work(ctx, payload):
+        await ctx.report_progress(0.5, "halfway")
+        stored = await queue.get(ctx.job.id)
+        assert stored.progress == 0.5
+        return {"answer": payload["x"] * 2}
+
+    job = await queue.enqueue("work", {"x": 21})
+    assert (await queue.get(job.id)).status == JobStatus.QUEUED
+
+    await queue.run_next(timeout=0)
+
+    done = await queue.get(job.id)
+    assert done.status == JobStatus.SUCCEEDED
+    assert done.progress == 1.0
+    assert done.result == {"answer": 42}
+
+
+@pytest.mark.asyncio
+async def test_job_retries_then_fails(queue: JobQueue) -> None:
+    """Test failing jobs are retried up to max_retries."""
+    calls = 0
+
+    @queue.task("flaky")
+    async def flaky(ctx, payload):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("boom")
+
+    job = await queue.enqueue("flaky", max_retries=2)
+    while await queue.run_next(timeout=0.1):
+        pass
+
+    failed = await queue.get(job.id)
+    assert calls == 3
+    assert failed.status == JobStatus.FAILED
+    assert failed.error == "RuntimeError: boom"
+
+
+@pytest.mark.asyncio
+async def test_redis_jobs_are_leased_until_acked(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a job whose worker died is requeued when its lease expires."""
+    from app.core.config import settings
+
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "_client", fake)
+    backend = RedisJobBackend()
+    queue = JobQueue(backend)
+    job = await queue.enqueue("work", max_retries=1)
+
+    # A worker pops the job, marks it running and dies without acking.
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", -1)
+    assert await backend.pop(timeout=0) == job.id
+    crashed = await queue.get(job.id)
+    crashed.status, crashed.attempts = JobStatus.RUNNING, 1
+    await backend.save(crashed)
+    assert job.id in fake.zsets[RedisJobBackend.PROCESSING_KEY]
+
+    # The expired lease puts it back on the ready queue for another worker.
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 60)
+
+    @queue.task("work")
+    async def work(ctx, payload):
+        return "done"
+
+    finished = await queue.run_next(timeout=0)
+    assert finished.id == job.id
+    assert (await queue.get(job.id)).status == JobStatus.SUCCEEDED
+    assert fake.zsets[RedisJobBackend.PROCESSING_KEY] == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_lease_is_renewed_while_running(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a handler outliving its lease is not delivered to a second worker."""
+    import asyncio
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(redis_client, "_client", FakeRedis())
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.3)
+    backend = RedisJobBackend()
+    queue = JobQueue(backend)
+    calls = 0
+
+    @queue.task("encode")
+    async def encode(ctx, payload):
+        nonlocal calls
+        calls += 1
+        # Runs for several lease periods without reporting progress.
+        await asyncio.sleep(1.0)
+
+    job = await queue.enqueue("encode")
+    first = asyncio.create_task(queue.run_next(timeout=0))
+    await asyncio.sleep(0.6)
+    assert await backend.pop(timeout=0) is None
+
+    assert (await first).id == job.id
+    assert calls == 1
+    assert (await queue.get(job.id)).status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_does_not_fall_back_to_memory(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test enqueueing fails while Redis is configured but down."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "JOB_QUEUE_BACKEND", "redis")
+    monkeypatch.setattr(redis_client, "_client", None)
+    queue = JobQueue()
+    with pytest.raises(JobQueueUnavailableError):
+        await queue.enqueue("work")
+
+    # Once Redis is back the queue recovers without a restart.
+    monkeypatch.setattr(redis_client, "_client", FakeRedis())
+    job = await queue.enqueue("work")
+    assert isinstance(queue.backend, RedisJobBackend)
+    assert (await queue.get(job.id)).status == JobStatus.QUEUED
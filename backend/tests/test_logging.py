@@ -0,0 +1,62 @@
+"""Structured logging tests."""
+
+import json
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.logging_config import (
+    ContextFilter,
+    CorrelationIdMiddleware,
+    JsonFormatter,
+    RateLimitFilter,
+    request_id,
+)
+
+
+def _record(msg: str, *args, level: int = logging.WARNING) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_suppresses_repeats_and_reports_count() -> None:
+    """Test identical warnings beyond the burst are dropped and counted."""
+    limiter = RateLimitFilter(burst=2, period=3600)
+    passed = [limiter.filter(_record("Douban search error: %s", n)) for n in range(5)]
+    assert passed == [True, True, False, False, False]
+    # Other templates and info records have their own budget.
+    assert limiter.filter(_record("YouTube search error: %s", 1))
+    assert limiter.filter(_record("Douban search error: %s", 6, level=logging.INFO))
+
+    # Once tokens refill, the next record reports what was dropped.
+    limiter._buckets[("app.test", "Douban search error: %s")][0] = 1.0
+    record = _record("Douban search error: %s", 7)
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed_and_logged() -> None:
+    """Test the correlation id reaches log records and the response header."""
+    records = []
+
+    async def app(scope, receive, send):
+        record = _record("handled %s", scope["path"], level=logging.INFO)
+        ContextFilter().filter(record)
+        records.append(record)
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    transport = ASGITransport(app=CorrelationIdMiddleware(app))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        given = await client.get("/a", headers={"X-Request-ID": "abc123"})
+        generated = await client.get("/b")
+
+    assert given.headers["x-request-id"] == "abc123"
+    assert generated.headers["x-request-id"] == records[1].request_id
+    assert request_id.get() is None
+
+    entry = json.loads(JsonFormatter().format(records[0]))
+    assert entry["request_id"] == "abc123"
+    assert entry["message"] == "handled /a"
+    assert entry["level"] == "INFO"
@@ -0,0 +1,99 @@
+"""Media processing tests."""
+
+import pytest
+from aiohttp import web
+
+from app.core.config import settings
+from app.models.media_info import MediaInfo
+from app.services.image_service import ImageFetchError, ImageService
+from app.services.probe_service import parse_keyframes, parse_probe
+from app.services.trickplay_service import build_vtt
+
+
+def test_trickplay_vtt_maps_intervals_to_tiles() -> None:
+    """Test each interval points at the right sheet and tile."""
+    vtt = build_vtt(
+        duration=45, interval=10, columns=2, rows=2, tile_width=160, tile_height=90
+    )
+    cues = [line for line in vtt.splitlines() if "#xywh=" in line]
+
+    assert vtt.startswith("WEBVTT")
+    assert cues == [
+        "trickplay_000.jpg#xywh=0,0,160,90",
+        "trickplay_000.jpg#xywh=160,0,160,90",
+        "trickplay_000.jpg#xywh=0,90,160,90",
+        "trickplay_000.jpg#xywh=160,90,160,90",
+        "trickplay_001.jpg#xywh=0,0,160,90",
+    ]
+    assert "00:00:40.000 --> 00:00:45.000" in vtt
+
+
+def test_parse_probe_extracts_stream_details() -> None:
+    """Test ffprobe JSON is mapped onto MediaInfo fields."""
+    info = parse_probe(
+        {
+            "format": {
+                "format_name": "mov,mp4,m4a,3gp,3g2,mj2",
+                "duration": "5400.5",
+                "bit_rate": "4500000",
+            },
+            "streams": [
+                {
+                    "codec_type": "video",
+                    "codec_name": "h264",
+                    "width": 1920,
+                    "height": 1080,
+                    "avg_frame_rate": "24000/1001",
+                },
+                {"codec_type": "audio", "codec_name": "aac"},
+            ],
+        }
+    )
+
+    assert info["video_codec"] == "h264"
+    assert info["audio_codec"] == "aac"
+    assert (info["width"], info["height"]) == (1920, 1080)
+    assert info["frame_rate"] == 23.976
+    assert info["bitrate"] == 4500000
+    assert info["duration_seconds"] == 5400.5
+
+
+def test_keyframe_index_answers_seeks() -> None:
+    """Test seeks resolve to the preceding keyframe's byte offset."""
+    keyframes = parse_keyframes(
+        "0.000000,48,K_\n0.041667,9120,__\n2.002000,88211,K_\n"
+        "4.004000,170002,K_\nN/A,N/A,K_\n"
+    )
+    media_info = MediaInfo(movie_id=1, keyframes=keyframes)
+
+    assert keyframes == [[0.0, 48], [2.002, 88211], [4.004, 170002]]
+    assert media_info.keyframe_at(3.5) == (2.002, 88211)
+    assert media_info.keyframe_at(0) == (0.0, 48)
+    assert media_info.keyframe_at(99) == (4.004, 170002)
+
+
+@pytest.mark.asyncio
+async def test_poster_fetch_checks_every_redirect_hop(monkeypatch) -> None:
+    """Test the image proxy only follows redirects to allowed hosts."""
+    app = web.Application()
+    app.router.add_get("/poster.jpg", lambda request: web.Response(body=b"jpeg"))
+    app.router.add_get("/moved.jpg", lambda request: web.HTTPFound("/poster.jpg"))
+    app.router.add_get(
+        "/evil.jpg",
+        lambda request: web.HTTPFound(
+            f"http://localhost:{request.url.port}/poster.jpg"
+        ),
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    monkeypatch.setattr(settings, "IMAGE_PROXY_ALLOWED_HOSTS", ["127.0.0.1"])
+    service = ImageService()
+    try:
+        assert await service._fetch(f"http://{host}:{port}/moved.jpg") == b"jpeg"
+        with pytest.raises(ImageFetchError, match="不允许"):
+            await service._fetch(f"http://{host}:{port}/evil.jpg")
+    finally:
+        await runner.cleanup()
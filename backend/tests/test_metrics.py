@@ -0,0 +1,51 @@
+"""Metrics tests."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    MetricsMiddleware,
+    MetricsRegistry,
+)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test histogram exposition uses cumulative buckets, sum and count."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+    child = latency.labels("/a")
+    for value in (0.05, 0.5, 5.0):
+        child.observe(value)
+    registry.counter("hits_total", "Hits").labels().inc(2)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert "# TYPE hits_total counter" in text
+    assert "hits_total 2" in text
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_by_route_template() -> None:
+    """Test requests are recorded under the route template, not the raw path."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for item_id in (1, 2, 3):
+            await client.get(f"/items/{item_id}")
+        await client.get("/missing/path")
+
+    matched = HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", 200)
+    unmatched = HTTP_REQUEST_DURATION.labels("GET", "unmatched", 404)
+    assert sum(matched.counts) == 3
+    assert sum(unmatched.counts) >= 1
@@ -0,0 +1,86 @@
+"""Model create helper tests."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Favorite, MediaInfo, Movie, User
+
+
+@pytest.fixture
+async def session(tmp_path):
+    """Session on a fresh SQLite database with all tables created."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'models.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_create_returns_server_defaults(session: AsyncSession) -> None:
+    """Test create loads generated columns without a refresh query."""
+    user = await User.create(
+        session, username="alice", email="alice@example.com", hashed_password="x"
+    )
+    movie = await Movie.create(session, title="Alien", user_id=user.id)
+    assert movie.id and movie.favorite_count == 0 and movie.is_local is False
+    favorite = await Favorite.create(session, user_id=user.id, movie_id=movie.id)
+
+    assert user.id and user.created_at is not None
+    assert favorite.id and favorite.created_at is not None
+    await session.refresh(movie)
+    assert movie.favorite_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_and_upsert(session: AsyncSession) -> None:
+    """Test bulk create keeps input order and upsert updates in place."""
+    user = await User.create(
+        session, username="bob", email="bob@example.com", hashed_password="x"
+    )
+    movies = await Movie.bulk_create(
+        session, [{"title": f"Movie {i}", "year": 2000 + i} for i in range(5)]
+    )
+    assert [m.title for m in movies] == [f"Movie {i}" for i in range(5)]
+    assert len({m.id for m in movies}) == 5
+
+    await Favorite.bulk_create(
+        session, [{"user_id": user.id, "movie_id": m.id} for m in movies[:2]]
+    )
+    await session.refresh(movies[0])
+    assert movies[0].favorite_count == 1
+
+    first = await MediaInfo.upsert(session, movies[0].id, width=640, height=360)
+    second = await MediaInfo.upsert(session, movies[0].id, width=1920, height=1080)
+    assert first.id == second.id
+    assert second.width == 1920
+
+
+@pytest.mark.asyncio
+async def test_favorites_keyset_pages_do_not_shift(session: AsyncSession) -> None:
+    """Test keyset pages cover every favorite once despite concurrent adds."""
+    user = await User.create(
+        session, username="carol", email="carol@example.com", hashed_password="x"
+    )
+    movies = await Movie.bulk_create(session, [{"title": f"M{i}"} for i in range(7)])
+    # Same created_at for all rows, so ties are broken by favorite id.
+    await Favorite.bulk_create(
+        session, [{"user_id": user.id, "movie_id": m.id} for m in movies[:5]]
+    )
+
+    first, total, key = await Favorite.get_user_movies(session, user.id, limit=2)
+    assert total == 5
+    # A favorite added meanwhile lands before the cursor and shifts nothing.
+    await Favorite.create(session, user_id=user.id, movie_id=movies[5].id)
+
+    seen = [m.title for m in first]
+    while key is not None:
+        page, _, key = await Favorite.get_user_movies(
+            session, user.id, limit=2, fields=("id", "title"), after=key
+        )
+        seen += [m["title"] for m in page]
+    assert seen == ["M4", "M3", "M2", "M1", "M0"]
@@ -0,0 +1,54 @@
+"""Profiler and event-loop lag monitor tests."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.profiler import EVENT_LOOP_STALLS, LoopLagMonitor, profile_event_loop
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _spin(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        # Hold the loop for ~50ms at a time, like a heavy validation or parse.
+        chunk_end = time.monotonic() + 0.05
+        while time.monotonic() < chunk_end:
+            sum(i * i for i in range(1_000))
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_captures_blocking_stack() -> None:
+    """Test a blocking call is reported once with its stack."""
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    stalls = EVENT_LOOP_STALLS.labels()
+    before = stalls.value
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.4)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    (stall,) = monitor.recent()
+    assert stall["blocked_for"] >= 0.1
+    assert "_block_the_loop" in stall["stack"]
+    assert stalls.value == before + 1
+
+
+@pytest.mark.asyncio
+async def test_profile_returns_collapsed_stacks() -> None:
+    """Test the loop thread is sampled while it keeps running coroutines."""
+    busy = asyncio.create_task(_spin(0.5))
+    output = await profile_event_loop(0.3, 0.005)
+    await busy
+
+    lines = output.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("_spin" in line for line in lines)
@@ -0,0 +1,53 @@
+"""Per-request query statistics tests."""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import query_stats
+from app.core.config import settings
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """Instrumented SQLite engine."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    query_stats.instrument_engine(engine.sync_engine, "test")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_flagged(engine) -> None:
+    """Test the same statement run per row is reported as an N+1 pattern."""
+    stats = query_stats.QueryStats()
+    token = query_stats.current_query_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            for movie_id in range(6):
+                await conn.execute(text("SELECT :id AS id"), {"id": movie_id})
+    finally:
+        query_stats.current_query_stats.reset(token)
+
+    assert stats.count == 7
+    assert stats.duration > 0
+    assert stats.repeated(5) == [("SELECT ? AS id", 6)]
+
+
+@pytest.mark.asyncio
+async def test_slow_select_logs_explain_plan(engine, monkeypatch, caplog) -> None:
+    """Test statements over the threshold are logged with their query plan."""
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 0.0)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE movies (id INTEGER, title TEXT)"))
+        with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+            result = await conn.execute(
+                text("SELECT title FROM movies WHERE id = :id"), {"id": 1}
+            )
+            assert result.all() == []
+
+    slow = [r.getMessage() for r in caplog.records if "SELECT title" in r.getMessage()]
+    assert slow and "SCAN movies" in slow[0]
@@ -0,0 +1,43 @@
+"""Upload storage tests."""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.storage_service import FileTooLargeError, store_upload
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Store uploads in a temporary directory."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_one_blob() -> None:
+    """Test the same content is stored once and addressed by its hash."""
+    content = b"movie-bytes" * 1000
+
+    first = await store_upload(UploadFile(io.BytesIO(content), filename="a.mp4"))
+    second = await store_upload(UploadFile(io.BytesIO(content), filename="b.MP4"))
+
+    assert first.sha256 == hashlib.sha256(content).hexdigest()
+    assert not first.deduplicated
+    assert second.deduplicated
+    assert second.path == first.path
+    assert first.path.endswith(f"{first.sha256}.mp4")
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected(upload_dir, monkeypatch) -> None:
+    """Test uploads over MAX_FILE_SIZE fail without leaving files behind."""
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+
+    with pytest.raises(FileTooLargeError):
+        await store_upload(UploadFile(io.BytesIO(b"x" * 11), filename="a.mp4"))
+
+    assert not list((upload_dir / "tmp").iterdir())
@@ -0,0 +1,74 @@
+"""Tracing tests."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core import tracing
+from app.core.tracing import FileExporter, InMemoryExporter, Tracer
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch) -> InMemoryExporter:
+    """Trace everything into an in-memory exporter."""
+    exporter = InMemoryExporter()
+    monkeypatch.setattr(tracing, "tracer", Tracer(exporter, sample_rate=1.0))
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_spans_propagate_through_gather(exporter: InMemoryExporter) -> None:
+    """Test concurrent child tasks attach their spans to the request's trace."""
+
+    @tracing.traced("source")
+    async def source(delay: float) -> None:
+        await asyncio.sleep(delay)
+        with tracing.tracer.span("parse"):
+            tracing.tracer.record_span("db.query", 0.001, statement="SELECT 1")
+
+    with tracing.tracer.start_trace("GET /search") as root:
+        await asyncio.gather(source(0.01), source(0))
+
+    (spans,) = exporter.recent()
+    by_name: dict[str, list[dict]] = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+
+    assert {span["trace_id"] for span in spans} == {root.trace_id}
+    assert [s["parent_id"] for s in by_name["source"]] == [root.span_id] * 2
+    source_ids = {s["span_id"] for s in by_name["source"]}
+    assert {s["parent_id"] for s in by_name["parse"]} == source_ids
+    parse_ids = {s["span_id"] for s in by_name["parse"]}
+    assert {s["parent_id"] for s in by_name["db.query"]} == parse_ids
+    assert by_name["GET /search"][0]["duration"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_record_nothing() -> None:
+    """Test spans are no-ops when the trace is not sampled."""
+    exporter = InMemoryExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    with tracer.start_trace("GET /") as root:
+        with tracer.span("child") as child:
+            pass
+
+    assert root is None and child is None
+    assert exporter.recent() == []
+
+
+def test_file_exporter_writes_from_background_thread(tmp_path) -> None:
+    """Test exported traces are written as JSON lines once the writer drains."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = FileExporter(str(path))
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    for name in ("GET /a", "GET /b"):
+        with tracer.start_trace(name):
+            with tracer.span("child"):
+                pass
+    exporter.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in lines] == ["child", "GET /a", "child", "GET /b"]
@@ -20,10 +20,12 @@ import {
 import { Link } from 'react-router-dom';
 import styled from 'styled-components';
 import { useAuth } from '../contexts/AuthContext';
-import api from '../services/api';
+import api, { posterUrl } from '../services/api';
 
 const { Title } = Typography;
 
+const PAGE_SIZE = 40;
+
 const Container = styled.div`
   max-width: 1200px;
   margin: 0 auto;
@@ -83,6 +85,9 @@ const Favorites = () => {
   const navigate = useNavigate();
   const [favorites, setFavorites] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
 
   useEffect(() => {
     if (user) {
@@ -90,23 +95,36 @@ const Favorites = () => {
     }
   }, [user]);
 
-  const fetchFavorites = async () => {
+  // 按游标翻页：首次请求第一页，之后带上 next_cursor 追加下一页
+  const fetchFavorites = async (cursor = null) => {
     try {
-      const response = await api.get('/api/v1/favorites');
-      setFavorites(response.data || []);
+      const params = { limit: PAGE_SIZE };
+      if (cursor) params.cursor = cursor;
+      const response = await api.get('/api/v1/favorites', { params });
+      const movies = response.data.movies || [];
+      setFavorites(prev => (cursor ? [...prev, ...movies] : movies));
+      setNextCursor(response.data.next_cursor || null);
+      setTotal(response.data.total || 0);
     } catch (error) {
       console.error('获取收藏列表失败:', error);
       message.error('获取收藏列表失败');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
+  const loadMore = () => {
+    setLoadingMore(true);
+    fetchFavorites(nextCursor);
+  };
+
   const removeFavorite = async (movieId) => {
     try {
       await api.delete(`/api/v1/favorites/${movieId}`);
       message.success('已取消收藏');
       setFavorites(favorites.filter(movie => movie.id !== movieId));
+      setTotal(count => Math.max(count - 1, 0));
     } catch (error) {
       message.error('取消收藏失败');
     }
@@ -132,6 +150,7 @@ const Favorites = () => {
         <Title level={2} className="title">
           <HeartFilled style={{ color: '#ff4d4f' }} />
           我的收藏
+          {total > 0 && <span style={{ fontSize: '16px', color: '#999' }}>（{total}）</span>}
         </Title>
         
         <Button type="primary" onClick={() => navigate('/search')}>
@@ -140,86 +159,95 @@ const Favorites = () => {
       </Header>
 
       {favorites.length > 0 ? (
-        <Row gutter={[24, 24]}>
-          {favorites.map((movie) => (
-            <Col xs={24} sm={12} md={8} lg={6} xl={4} key={movie.id}>
-              <MovieCard
-                hoverable
-                cover={
-                  movie.poster_url ? (
-                    <img alt={movie.title} src={movie.poster_url} />
-                  ) : (
-                    <div style={{ 
-                      height: '300px', 
-                      background: 'linear-gradient(45deg, #e0e0e0, #f0f0f0)',
-                      display: 'flex',
-                      alignItems: 'center',
-                      justifyContent: 'center',
-                      color: '#666',
-                      fontSize: '18px'
-                    }}>
-                      暂无海报
-                    </div>
-                  )
-                }
-                actions={[
-                  getStreamingUrl(movie) && (
-                    <Button
-                      type="text"
-                      icon={<PlayCircleOutlined />}
-                      onClick={() => window.open(getStreamingUrl(movie), '_blank')}
-                      style={{ color: '#333' }}
-                    >
-                      播放
-                    </Button>
-                  ),
-                  <Link to={`/movie/${movie.id}`}>
-                    <Button
-                      type="text"
-                      style={{ color: '#333' }}
-                    >
-                      详情
-                    </Button>
-                  </Link>,
-                  <Popconfirm
-                    title="确定要取消收藏吗？"
-                    onConfirm={() => removeFavorite(movie.id)}
-                    okText="确定"
-                    cancelText="取消"
-                  >
-                    <Button
-                      type="text"
-                      icon={<DeleteOutlined />}
-                      style={{ color: '#ff4d4f' }}
-                    >
-                      取消收藏
-                    </Button>
-                  </Popconfirm>
-                ].filter(Boolean)}
-              >
-                <Card.Meta
-                  title={movie.title}
-                  description={
-                    <div>
-                      {movie.year && <div>年份: {movie.year}</div>}
-                      {movie.genre && <div>类型: {movie.genre}</div>}
-                      {movie.rating && (
-                        <div style={{ display: 'flex', alignItems: 'center', gap: '5px' }}>
-                          评分: {movie.rating}
-                        </div>
-                      )}
-                      {movie.is_local && (
-                        <div style={{ color: '#52c41a', fontSize: '12px', marginTop: '5px' }}>
-                          本地上传
-                        </div>
-                      )}
-                    </div>
+        <>
+          <Row gutter={[24, 24]}>
+            {favorites.map((movie) => (
+              <Col xs={24} sm={12} md={8} lg={6} xl={4} key={movie.id}>
+                <MovieCard
+                  hoverable
+                  cover={
+                    movie.poster_url ? (
+                      <img alt={movie.title} src={posterUrl(movie.poster_url)} />
+                    ) : (
+                      <div style={{ 
+                        height: '300px', 
+                        background: 'linear-gradient(45deg, #e0e0e0, #f0f0f0)',
+                        display: 'flex',
+                        alignItems: 'center',
+                        justifyContent: 'center',
+                        color: '#666',
+                        fontSize: '18px'
+                      }}>
+                        暂无海报
+                      </div>
+                    )
                   }
-                />
-              </MovieCard>
-            </Col>
-          ))}
-        </Row>
+                  actions={[
+                    getStreamingUrl(movie) && (
+                      <Button
+                        type="text"
+                        icon={<PlayCircleOutlined />}
+                        onClick={() => window.open(getStreamingUrl(movie), '_blank')}
+                        style={{ color: '#333' }}
+                      >
+                        播放
+                      </Button>
+                    ),
+                    <Link to={`/movie/${movie.id}`}>
+                      <Button
+                        type="text"
+                        style={{ color: '#333' }}
+                      >
+                        详情
+                      </Button>
+                    </Link>,
+                    <Popconfirm
+                      title="确定要取消收藏吗？"
+                      onConfirm={() => removeFavorite(movie.id)}
+                      okText="确定"
+                      cancelText="取消"
+                    >
+                      <Button
+                        type="text"
+                        icon={<DeleteOutlined />}
+                        style={{ color: '#ff4d4f' }}
+                      >
+                        取消收藏
+                      </Button>
+                    </Popconfirm>
+                  ].filter(Boolean)}
+                >
+                  <Card.Meta
+                    title={movie.title}
+                    description={
+                      <div>
+                        {movie.year && <div>年份: {movie.year}</div>}
+                        {movie.genre && <div>类型: {movie.genre}</div>}
+                        {movie.rating && (
+                          <div style={{ display: 'flex', alignItems: 'center', gap: '5px' }}>
+                            评分: {movie.rating}
+                          </div>
+                        )}
+                        {movie.is_local && (
+                          <div style={{ color: '#52c41a', fontSize: '12px', marginTop: '5px' }}>
+                            本地上传
+                          </div>
+                        )}
+                      </div>
+                    }
+                  />
+                </MovieCard>
+              </Col>
+            ))}
+          </Row>
+          {nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: '40px' }}>
+              <Button size="large" loading={loadingMore} onClick={loadMore}>
+                加载更多（已显示 {favorites.length} / {total}）
+              </Button>
+            </div>
+          )}
+        </>
       ) : (
         <Empty
           description="还没有收藏任何电影"
@@ -3,7 +3,7 @@ import { Row, Col, Card, Typography, Button, Spin, Empty } from 'antd';
 import { PlayCircleOutlined, StarOutlined, FireOutlined } from '@ant-design/icons';
 import { Link } from 'react-router-dom';
 import styled from 'styled-components';
-import api from '../services/api';
+import api, { posterUrl } from '../services/api';
 
 const { Title, Paragraph } = Typography;
 
@@ -125,7 +125,7 @@ const Home = () => {
                   hoverable
                   cover={
                     movie.poster_url ? (
-                      <img alt={movie.title} src={movie.poster_url} />
+                      <img alt={movie.title} src={posterUrl(movie.poster_url)} />
                     ) : (
                       <div style={{ 
                         height: '300px', 
@@ -177,7 +177,7 @@ const Home = () => {
                       hoverable
                       cover={
                         movie.poster_url ? (
-                          <img alt={movie.title} src={movie.poster_url} />
+                          <img alt={movie.title} src={posterUrl(movie.poster_url)} />
                         ) : (
                           <div style={{ 
                             height: '300px', 
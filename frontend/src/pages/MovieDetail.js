@@ -21,7 +21,7 @@ import {
 import styled from 'styled-components';
 import ReactPlayer from 'react-player';
 import { useAuth } from '../contexts/AuthContext';
-import api from '../services/api';
+import api, { posterUrl } from '../services/api';
 
 const { Title, Paragraph, Text } = Typography;
 
@@ -154,9 +154,8 @@ const MovieDetail = () => {
 
   const checkFavoriteStatus = useCallback(async () => {
     try {
-      const response = await api.get('/api/v1/favorites');
-      const favorites = response.data || [];
-      setIsFavorite(favorites.some(m => m.id === parseInt(id)));
+      const response = await api.get(`/api/v1/favorites/${id}`);
+      setIsFavorite(response.data.is_favorite);
     } catch (error) {
       console.error('检查收藏状态失败:', error);
     }
@@ -282,7 +281,7 @@ const MovieDetail = () => {
       <MovieHeader>
         <MoviePoster>
           {movie.poster_url ? (
-            <img alt={movie.title} src={movie.poster_url} />
+            <img alt={movie.title} src={posterUrl(movie.poster_url, 'detail')} />
           ) : (
             <div className="placeholder">暂无海报</div>
           )}
@@ -12,7 +12,7 @@ import {
 } from 'antd';
 import { SearchOutlined, PlayCircleOutlined, StarOutlined } from '@ant-design/icons';
 import styled from 'styled-components';
-import api from '../services/api';
+import api, { posterUrl } from '../services/api';
 
 const { Title, Text } = Typography;
 const { Search } = Input;
@@ -197,7 +197,7 @@ const SearchPage = () => {
                 <div style={{ display: 'flex' }}>
                   <MoviePoster>
                     {movie.poster_url ? (
-                      <img alt={movie.title} src={movie.poster_url} />
+                      <img alt={movie.title} src={posterUrl(movie.poster_url)} />
                     ) : (
                       <div className="placeholder">暂无海报</div>
                     )}
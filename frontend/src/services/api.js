@@ -1,6 +1,8 @@
 import axios from 'axios';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+// 本地电影派生文件（海报等）的地址，形如 /api/v1/movies/{id}/media/poster.jpg
+const LOCAL_POSTER_PATTERN = /^\/api\/v1\/movies\/(\d+)\/media\//;
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -35,4 +37,20 @@ api.interceptors.response.use(
   }
 );
 
+// 通过后端图片代理获取缩放后的海报（thumbnail / card / detail）
+export const posterUrl = (url, size = 'card') => {
+  if (!url) {
+    return url;
+  }
+  const local = url.match(LOCAL_POSTER_PATTERN);
+  if (local) {
+    // 本地电影的海报使用上传后提取好的对应尺寸
+    return `${API_BASE_URL}/api/v1/images/movies/${local[1]}/${size}`;
+  }
+  if (url.startsWith('/')) {
+    return `${API_BASE_URL}${url}`;
+  }
+  return `${API_BASE_URL}/api/v1/images/poster?size=${size}&url=${encodeURIComponent(url)}`;
+};
+
 export default api;
\ No newline at end of file